@@ -0,0 +1,71 @@
+"""
+Model construction and `json()` round-trips, on data read from the recorded cassettes
+"""
+import pytest
+
+from blaseball_mike import chronicler, database
+from blaseball_mike.models import Feed, Game, Player, Team
+
+from helpers import replay
+
+
+@pytest.fixture(scope="module")
+def games_data():
+    with replay("TestGame.test_load_by_season"):
+        return [game["data"] for game in chronicler.get_games(season=6)]
+
+
+@pytest.fixture(scope="module")
+def players_data():
+    with replay("TestPlayer.test_load_all"):
+        return [player["data"] for player in chronicler.get_entities("player")]
+
+
+@pytest.fixture(scope="module")
+def teams_data():
+    with replay("TestTeam.test_load_all"):
+        return list(database.get_all_teams().values())
+
+
+@pytest.fixture(scope="module")
+def feed_data():
+    with replay("Fixture.feed_global_current"):
+        return database.get_feed_global(limit=3)
+
+
+@pytest.mark.parametrize("model, data", [
+    (Game, "games_data"),
+    (Player, "players_data"),
+    (Team, "teams_data"),
+    (Feed, "feed_data"),
+])
+def test_construct(benchmark, request, model, data):
+    data = request.getfixturevalue(data)
+    benchmark.extra_info["objects"] = len(data)
+    result = benchmark(lambda: [model(x) for x in data])
+    assert len(result) == len(data)
+
+
+@pytest.mark.parametrize("model, data", [
+    (Game, "games_data"),
+    (Player, "players_data"),
+    (Team, "teams_data"),
+    (Feed, "feed_data"),
+])
+def test_json(benchmark, request, model, data):
+    objects = [model(x) for x in request.getfixturevalue(data)]
+    benchmark.extra_info["objects"] = len(objects)
+    result = benchmark(lambda: [x.json() for x in objects])
+    assert len(result) == len(objects)
+
+
+@pytest.mark.parametrize("model, data", [
+    (Game, "games_data"),
+    (Player, "players_data"),
+    (Team, "teams_data"),
+])
+def test_json_round_trip(benchmark, request, model, data):
+    objects = [model(x) for x in request.getfixturevalue(data)]
+    benchmark.extra_info["objects"] = len(objects)
+    result = benchmark(lambda: [model(x.json()) for x in objects])
+    assert result == objects
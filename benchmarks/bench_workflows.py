@@ -0,0 +1,76 @@
+"""
+Common workflows replayed from the recorded cassettes, including the number of requests each one makes.
+
+Request counts do not depend on the machine, so they are checked exactly: a change that makes a workflow send more
+requests fails here even when timings are not compared.
+"""
+import pytest
+
+from blaseball_mike import chronicler, database
+from blaseball_mike.models import Feed, Game, Player, Team
+
+from helpers import count_requests, replay
+
+CRABS = "8d87c468-699a-47a8-b40d-cfb73a5660ad"
+
+
+def _check_requests(benchmark, cassette, func, expected):
+    _, requests = count_requests(cassette, func)
+    benchmark.extra_info["requests"] = requests
+    assert requests == expected
+
+
+@pytest.fixture(scope="module")
+def crabs_data():
+    with replay("Fixture.team_crabs"):
+        return database.get_team(CRABS)
+
+
+@pytest.fixture(scope="module")
+def feed_data():
+    with replay("Fixture.feed_global_current"):
+        return database.get_feed_global(limit=3)
+
+
+def test_team_lineup(benchmark, crabs_data):
+    """Lazy loading a lineup, from a fresh `Team` every round"""
+    def lineup(team):
+        return team.lineup
+
+    with replay("TestTeam.test_lineup[team_crabs]") as cassette:
+        _check_requests(benchmark, cassette, lambda: lineup(Team(crabs_data)), 1)
+        result = benchmark.pedantic(lineup, setup=lambda: ((Team(crabs_data),), {}), rounds=50)
+    assert all(isinstance(x, Player) for x in result)
+
+
+def test_feed_tags(benchmark, feed_data):
+    """Lazy loading the tagged players and teams of each feed item, one request per tag"""
+    def tags(feed):
+        return [(item.player_tags, item.team_tags, item.game_tags) for item in feed]
+
+    with replay("TestFeed.test_global_event[feed_global_current]") as cassette:
+        _check_requests(benchmark, cassette, lambda: tags([Feed(x) for x in feed_data]), 5)
+        result = benchmark.pedantic(tags, setup=lambda: (([Feed(x) for x in feed_data],), {}), rounds=50)
+    assert len(result) == len(feed_data)
+
+
+def test_game_load_by_season(benchmark):
+    with replay("TestGame.test_load_by_season") as cassette:
+        _check_requests(benchmark, cassette, lambda: Game.load_by_season(season=6), 1)
+        result = benchmark.pedantic(Game.load_by_season, kwargs={"season": 6}, rounds=10)
+    assert len(result) > 0
+
+
+def test_player_load_all(benchmark):
+    with replay("TestPlayer.test_load_all") as cassette:
+        _check_requests(benchmark, cassette, Player.load_all, 1)
+        result = benchmark.pedantic(Player.load_all, rounds=10)
+    assert len(result) > 0
+
+
+def test_chronicler_pagination(benchmark):
+    """Paging through Chronicler v1 updates, 250 at a time"""
+    with replay("test_chronicler_team_updates[1000]") as cassette:
+        _check_requests(benchmark, cassette, lambda: chronicler.get_team_updates(count=1000), 4)
+        result = benchmark.pedantic(chronicler.get_team_updates, kwargs={"count": 1000}, rounds=10)
+    assert len(result) == 1000
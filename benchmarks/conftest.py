@@ -0,0 +1,14 @@
+"""
+Benchmark suite fixtures. The HTTP cache is turned off for the whole run, so every call is served by a cassette (see
+`helpers.replay`) and can be counted.
+"""
+import pytest
+
+from blaseball_mike.session import configure_cache
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cache_disabled():
+    configure_cache(enabled=False)
+    yield
+    configure_cache(enabled=True)
@@ -0,0 +1,60 @@
+"""
+Helpers for replaying recorded cassettes in benchmarks.
+
+Benchmarks replay the cassettes recorded for the test suite, so they run offline and every round sees the same data.
+Requests are matched without their host, since the cassettes were recorded against several hosts of the same API
+(ie `www.blaseball.com` and `api.blaseball.com`).
+"""
+import contextlib
+import os
+
+import vcr
+from vcr.persisters.filesystem import FilesystemPersister
+
+CASSETTE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "test_data",
+                            "cassettes")
+
+
+class _MultiCassettePersister:
+    """Loads several cassette files, joined with `os.pathsep`, as a single read-only cassette"""
+
+    @staticmethod
+    def load_cassette(cassette_path, serializer):
+        requests, responses = [], []
+        for path in cassette_path.split(os.pathsep):
+            if not os.path.isfile(path):
+                # vcr would quietly start an empty cassette instead
+                raise FileNotFoundError(f"Missing cassette: {path}")
+            cassette_requests, cassette_responses = FilesystemPersister.load_cassette(path, serializer)
+            requests.extend(cassette_requests)
+            responses.extend(cassette_responses)
+        return requests, responses
+
+    @staticmethod
+    def save_cassette(cassette_path, cassette_dict, serializer):
+        raise RuntimeError("Benchmarks only replay cassettes")
+
+
+_vcr = vcr.VCR(
+    record_mode="none",
+    match_on=("method", "scheme", "path", "query"),
+)
+_vcr.register_persister(_MultiCassettePersister)
+
+
+@contextlib.contextmanager
+def replay(*names):
+    """
+    Replay one or more cassettes from `tests/test_data/cassettes`, given without their `.yaml` extension.
+    Yields the cassette; `cassette.play_count` is the number of requests served so far.
+    """
+    path = os.pathsep.join(os.path.join(CASSETTE_DIR, f"{name}.yaml") for name in names)
+    with _vcr.use_cassette(path, allow_playback_repeats=True) as cassette:
+        yield cassette
+
+
+def count_requests(cassette, func, *args, **kwargs):
+    """Call `func` once and return its result and the number of requests it made"""
+    before = cassette.play_count
+    result = func(*args, **kwargs)
+    return result, cassette.play_count - before
@@ -0,0 +1,50 @@
+"""
+Measure cold-start import time of blaseball_mike.
+
+Each statement is run in a fresh interpreter several times and the median wall time is reported, alongside a
+bare interpreter start for reference. `from blaseball_mike.models import *` imports every model, which is what
+`import blaseball_mike.models` used to cost before sub-modules were loaded lazily.
+
+    python benchmarks/import_time.py [--runs N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = [
+    "pass",
+    "import blaseball_mike",
+    "import blaseball_mike.chronicler",
+    "import blaseball_mike.models",
+    "from blaseball_mike.models import Player",
+    "from blaseball_mike.models import *",
+    "import blaseball_mike.stream_model",
+]
+
+
+def measure(statement, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of blaseball_mike")
+    parser.add_argument("--runs", type=int, default=10, help="interpreter starts per statement")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    for statement in STATEMENTS:
+        median = measure(statement, args.runs)
+        if baseline is None:
+            baseline = median
+        print(f"{median * 1000:8.1f} ms  {(median - baseline) * 1000:+8.1f} ms  {statement}")
+
+
+if __name__ == "__main__":
+    main()
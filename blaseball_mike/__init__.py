@@ -4,3 +4,18 @@ over the main public API and various fan-created archives and databases.
 
 .. include:: ../docs/intro.md
 """
+import importlib
+
+# Sub-modules are imported on first access, so `import blaseball_mike` stays cheap
+__all__ = ["bundle", "chronicler", "database", "events", "eventually", "ingest", "models", "reference",
+           "search_index", "session", "stream_model", "tables", "tracing", "utils"]
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f".{name}", __name__)
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
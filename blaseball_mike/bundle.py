@@ -0,0 +1,163 @@
+"""
+Reference data bundled with the package, so it can be loaded from disk instead of downloaded on every run.
+
+The bundle shipped with the package lives in `blaseball_mike/data`. `manifest.json` records the bundle version and
+where and when each file was downloaded. Refresh it from the network with:
+
+    python -m blaseball_mike.bundle refresh [name ...]
+
+Refreshed files are written to a user data directory (`BLASEBALL_MIKE_DATA_DIR` if set, otherwise
+`~/.blaseball_mike/data`) rather than into the installed package. A refreshed file is only used if it is at least as
+recent as the copy shipped with the package, so upgrading the package never leaves you on older data.
+
+The shipped bundle is regenerated from the API before a release, from a source checkout, with:
+
+    python -m blaseball_mike.bundle refresh --package
+
+Only data sets in the package manifest are shipped; the others in `SOURCES` are available once refreshed.
+Tarot and damage types are already part of `blaseball_mike.tables` and are not duplicated here.
+"""
+import argparse
+import copy
+import functools
+import json
+import os
+from datetime import datetime, timezone
+
+from . import chronicler, database
+
+PACKAGE_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+PACKAGE_MANIFEST_PATH = os.path.join(PACKAGE_DATA_DIR, "manifest.json")
+
+# name -> function downloading the current version
+SOURCES = {
+    "weather": database.get_weather,
+    "old_items": chronicler.get_old_items,
+    "attributes": database.get_all_attributes,
+    "glossary": database.get_glossary,
+    "library": database.get_library,
+    "stadium_prefabs": database.get_stadium_prefabs,
+}
+
+
+def data_dir():
+    """Returns the user data directory refreshed files are written to and read from"""
+    return os.getenv("BLASEBALL_MIKE_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".blaseball_mike", "data")
+
+
+@functools.lru_cache(maxsize=None)
+def _load(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _read_manifest(directory):
+    path = os.path.join(directory, "manifest.json")
+    if not os.path.exists(path):
+        return {"version": None, "files": {}}
+    return _load(path)
+
+
+def _entry(name):
+    # Returns (directory, manifest entry) of the copy to use. A refreshed copy wins over the one shipped with the
+    # package unless it is older
+    shipped = _read_manifest(PACKAGE_DATA_DIR)["files"].get(name)
+    user_dir = data_dir()
+    refreshed = _read_manifest(user_dir)["files"].get(name)
+    if refreshed is not None and (shipped is None or refreshed["retrieved"] >= shipped["retrieved"]):
+        return user_dir, refreshed
+    return PACKAGE_DATA_DIR, shipped
+
+
+def manifest():
+    """Returns the manifest of the files `load` would use, or an empty one if nothing has been bundled"""
+    files = {}
+    for name in SOURCES:
+        _, entry = _entry(name)
+        if entry is not None:
+            files[name] = copy.deepcopy(entry)
+    return {"version": max((x["retrieved"] for x in files.values()), default=None), "files": files}
+
+
+def load(name):
+    """
+    Returns the bundled copy of a data set, or `None` if it is not bundled. The file is only read once per process;
+    callers must not modify what they get back.
+
+    Args:
+        name: one of `SOURCES`.
+    """
+    if name not in SOURCES:
+        raise ValueError(f"Unknown reference data: {name}")
+    directory, entry = _entry(name)
+    if entry is None:
+        return None
+    path = os.path.join(directory, entry["file"])
+    if not os.path.exists(path):
+        return None
+    return _load(path)
+
+
+def refresh(names=None, package=False):
+    """
+    Download the current version of bundled data sets and write them to the user data directory, updating its
+    manifest. The installed package is not modified, so this works for read-only installs.
+
+    Args:
+        names: list of data sets to refresh, defaults to all of `SOURCES`.
+        package: write to the bundle shipped with the package instead, to regenerate it before a release.
+    """
+    names = list(SOURCES) if names is None else names
+    for name in names:
+        if name not in SOURCES:
+            raise ValueError(f"Unknown reference data: {name}")
+
+    directory = PACKAGE_DATA_DIR if package else data_dir()
+    os.makedirs(directory, exist_ok=True)
+    info = copy.deepcopy(_read_manifest(directory))
+    retrieved = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    for name in names:
+        data = SOURCES[name]()
+        path = os.path.join(directory, f"{name}.json")
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(f"{path}.tmp", path)
+        source = SOURCES[name]
+        info["files"][name] = {
+            "file": f"{name}.json",
+            "source": f"{source.__module__}.{source.__name__}",
+            "retrieved": retrieved,
+        }
+
+    info["version"] = max(entry["retrieved"] for entry in info["files"].values())
+    manifest_path = os.path.join(directory, "manifest.json")
+    with open(f"{manifest_path}.tmp", "w") as f:
+        json.dump(info, f, indent=2)
+        f.write("\n")
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    _load.cache_clear()
+    return manifest()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m blaseball_mike.bundle", description=__doc__.strip().split("\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    refresh_parser = subparsers.add_parser("refresh", help="download the current reference data into the bundle")
+    refresh_parser.add_argument("names", nargs="*", help=f"data sets to refresh ({', '.join(SOURCES)}), default all")
+    refresh_parser.add_argument("--package", action="store_true",
+                                help="regenerate the bundle shipped with the package instead of the user copy")
+    subparsers.add_parser("show", help="print the bundle manifest")
+    args = parser.parse_args(argv)
+
+    if args.command == "refresh":
+        try:
+            info = refresh(args.names or None, package=args.package)
+        except ValueError as error:
+            parser.error(str(error))
+    else:
+        info = manifest()
+    print(json.dumps(info, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,35 @@
 """
 Wrappers for the Chronicler API endpoints for historical data
 """
-from .chron_helpers import *
-from .v1 import *
-from .v2 import *
+import importlib
 
-# Make pdoc happy
-__all__ = [x for x in [*dir(v1), *dir(v2)] if str(x).startswith("get")]
+# The endpoint modules (and the HTTP stack behind them) are only imported when first used, see `__getattr__`
+_SUBMODULES = ("chron_helpers", "v1", "v2")
+
+
+def _public_names(module):
+    return [x for x in dir(module) if not x.startswith("_")]
+
+
+def __getattr__(name):
+    modules = [importlib.import_module(f".{x}", __name__) for x in _SUBMODULES]
+
+    if name == "__all__":
+        # Make pdoc happy
+        value = [x for module in modules[1:] for x in dir(module) if str(x).startswith("get")]
+    else:
+        # Later modules take precedence, as with the star imports this replaces
+        for module in reversed(modules):
+            if name in _public_names(module):
+                value = getattr(module, name)
+                break
+        else:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    modules = [importlib.import_module(f".{x}", __name__) for x in _SUBMODULES]
+    return sorted({*globals(), *(x for module in modules for x in _public_names(module))})
@@ -3,9 +3,11 @@
 API Reference (out of date): https://astrid.stoplight.io/docs/sibr/reference/Chronicler.v1.yaml
 """
 from .chron_helpers import paged_get, prepare_id
-from datetime import datetime
-from dateutil.parser import parse
-from blaseball_mike.session import session, check_network_response, TIMESTAMP_FORMAT
+from bisect import bisect_right
+from datetime import datetime, timezone
+from time import monotonic
+from blaseball_mike.session import session, check_network_response, TIMESTAMP_FORMAT, _caching_disabled
+from blaseball_mike.utils import parse_timestamp
 
 BASE_URL = 'https://api.sibr.dev/chronicler/v1'
 
@@ -363,36 +365,104 @@ def time_map(season=None, tournament=None, day=None, include_nongame=True, cache
     """
     if season is not None and tournament is not None:
         raise ValueError("Cannot set both Season and Tournament")
-    if season is not None:
-        season = season - 1
-    if day is not None:
-        day = day - 1
+    return get_time_map(cache_time=cache_time).filter(season=season, tournament=tournament, day=day,
+                                                      include_nongame=include_nongame)
+
+
+class TimeMap:
+    """
+    Indexed copy of the Chronicler time map, from `get_time_map`.
+
+    Entries are parsed once and indexed by season, tournament and day, so lookups do not scan the whole map, and
+    `gameday_at` finds the day in progress at a timestamp with a binary search.
+    """
+    def __init__(self, entries):
+        self.entries = []
+        self._by_tournament = {}
+        self._by_season = {}
+        self._by_season_day = {}
+        for entry in entries:
+            entry = dict(entry)
+            entry["startTime"] = parse_timestamp(entry["startTime"])
+            if entry["endTime"] is not None:
+                entry["endTime"] = parse_timestamp(entry["endTime"])
+            self.entries.append(entry)
+
+            self._by_tournament.setdefault(entry["tournament"], []).append(entry)
+            if entry["tournament"] == -1:
+                self._by_season.setdefault(entry["season"], []).append(entry)
+                self._by_season_day.setdefault((entry["season"], entry["day"]), []).append(entry)
+
+        self._by_start = sorted(self.entries, key=lambda x: x["startTime"])
+        self._starts = [entry["startTime"] for entry in self._by_start]
+
+    def filter(self, season=None, tournament=None, day=None, include_nongame=True):
+        """
+        Same as `time_map`, without fetching the map again. Season and day are 1-indexed.
+        """
+        if season is not None and tournament is not None:
+            raise ValueError("Cannot set both Season and Tournament")
+        if season is not None:
+            season = season - 1
+        if day is not None:
+            day = day - 1
 
-    s = session(cache_time)
-    results = check_network_response(s.get(f'{BASE_URL}/time/map'))['data']
-
-    # Filter out desired events
-    if tournament is not None:
         # Season is not always -1 if a tournament is active, so ignore it
-        results = list(filter(lambda x: x['tournament'] == tournament, results))
+        if tournament is not None:
+            results = self._by_tournament.get(tournament, [])
+        elif season is not None and day is not None:
+            results = self._by_season_day.get((season, day), [])
+        elif season is not None:
+            results = self._by_season.get(season, [])
+        else:
+            results = self.entries
 
-    if season is not None:
-        results = list(filter(lambda x: x['tournament'] == -1 and x['season'] == season, results))
+        if day is not None:
+            results = [x for x in results if x["day"] == day]
+        if not include_nongame:
+            results = [x for x in results if x["type"] in ('season', 'tournament', 'postseason')]
 
-    if day is not None:
-        results = list(filter(lambda x: x['day'] == day, results))
+        # Callers are free to modify what they get back
+        return [dict(x) for x in results]
 
-    # Optionally filter out phase-change events
-    if not include_nongame:
-        results = list(filter(lambda x: x['type'] in ('season', 'tournament', 'postseason'), results))
+    def gameday_at(self, timestamp):
+        """
+        Returns the time map entry in progress at a string or datetime timestamp, or `None`. Naive datetimes are
+        treated as UTC. Season and day in the returned entry are 0-indexed, as in `time_map`.
+        """
+        if isinstance(timestamp, str):
+            timestamp = parse_timestamp(timestamp)
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
 
-    # Convert time strings into datetime objects
-    for result in results:
-        result["startTime"] = parse(result["startTime"])
-        if result["endTime"] is not None:
-            result["endTime"] = parse(result["endTime"])
+        index = bisect_right(self._starts, timestamp) - 1
+        if index < 0:
+            return None
+        entry = self._by_start[index]
+        if entry["endTime"] is not None and timestamp >= entry["endTime"]:
+            return None
+        return dict(entry)
 
-    return results
+
+_TIME_MAPS = {}
+
+
+def get_time_map(cache_time=3600):
+    """
+    Returns the full time map as an indexed `TimeMap`. The parsed map is kept for `cache_time` seconds, or
+    forever if `None`.
+    """
+    if _caching_disabled():
+        cache_time = 0
+
+    cached = _TIME_MAPS.get("map")
+    if cached is not None and (cache_time is None or monotonic() - cached[0] < cache_time):
+        return cached[1]
+
+    s = session(cache_time)
+    time_map_ = TimeMap(check_network_response(s.get(f'{BASE_URL}/time/map'))['data'])
+    _TIME_MAPS["map"] = (monotonic(), time_map_)
+    return time_map_
 
 
 def time_season(season=None, tournament=None, cache_time=3600):
@@ -434,13 +504,13 @@ def time_season(season=None, tournament=None, cache_time=3600):
 
     # Convert time strings into datetime objects
     for result in results:
-        result["startTime"] = parse(result["startTime"])
+        result["startTime"] = parse_timestamp(result["startTime"])
         if result["seasonStartTime"] is not None:
-            result["seasonStartTime"] = parse(result["seasonStartTime"])
+            result["seasonStartTime"] = parse_timestamp(result["seasonStartTime"])
         if result["postseasonStartTime"] is not None:
-            result["postseasonStartTime"] = parse(result["postseasonStartTime"])
+            result["postseasonStartTime"] = parse_timestamp(result["postseasonStartTime"])
         if result["endTime"] is not None:
-            result["endTime"] = parse(result["endTime"])
+            result["endTime"] = parse_timestamp(result["endTime"])
 
     return results
 
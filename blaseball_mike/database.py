@@ -3,12 +3,25 @@ Wrappers for the Official Blaseball API
 
 https://docs.sibr.dev/docs/apis/reference/Blaseball-API.v1.yaml
 """
-from blaseball_mike.session import session, check_network_response, TIMESTAMP_FORMAT
+from blaseball_mike.session import session, check_network_response, TIMESTAMP_FORMAT, ContextThreadPoolExecutor
 from datetime import datetime
 
 BASE_URL = 'https://api.blaseball.com'
 BASE_GITHUB = 'https://raw.githubusercontent.com/xSke/blaseball-site-files/main/data'
 CONFIG_S3_URL = 'https://blaseball-configs.s3.us-west-2.amazonaws.com'
+# Maximum number of IDs sent in a single request, to keep URLs within server limits
+MAX_IDS_PER_REQUEST = 100
+
+
+def _get_by_ids(url, ids, cache_time):
+    if isinstance(ids, str):
+        ids = ids.split(',')
+    s = session(cache_time)
+    result = {}
+    for i in range(0, len(ids), MAX_IDS_PER_REQUEST):
+        res = s.get(f'{url}?ids={",".join(ids[i:i + MAX_IDS_PER_REQUEST])}')
+        result.update({x['id']: x for x in check_network_response(res)})
+    return result
 
 
 def get_global_events(*, cache_time=5):
@@ -104,16 +117,13 @@ def get_player(id_, cache_time=5):
     Get players by ID. Returns a dictionary with player ID as key
 
     Args:
-        id_: player ID(s). Can be single string id_, comma separated string, or list.
+        id_: player ID(s). Can be single string id_, comma separated string, or list. Long lists are split
+            across several requests.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
     if len(id_) == 0:
         return {}
-    if isinstance(id_, list):
-        id_ = ','.join(id_)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/players?ids={id_}')
-    return {p['id']: p for p in check_network_response(res)}
+    return _get_by_ids(f'{BASE_URL}/database/players', id_, cache_time)
 
 
 def get_games(season, day, cache_time=5):
@@ -312,14 +322,11 @@ def get_game_statsheets(ids, cache_time=5):
     Get statsheets for a game by statsheet ID
 
     Args:
-        id: game statsheet ID(s). Can be a single string ID, comma separated string, or list.
+        id: game statsheet ID(s). Can be a single string ID, comma separated string, or list. Long lists are
+            split across several requests.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(ids, list):
-        ids = ','.join(ids)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/gameStatsheets?ids={ids}')
-    return {s['id']: s for s in check_network_response(res)}
+    return _get_by_ids(f'{BASE_URL}/database/gameStatsheets', ids, cache_time)
 
 
 def get_player_statsheets(ids, cache_time=5):
@@ -327,14 +334,11 @@ def get_player_statsheets(ids, cache_time=5):
     Get statsheets for a player by statsheet ID
 
     Args:
-        id: player statsheet ID(s). Can be a single string ID, comma separated string, or list.
+        id: player statsheet ID(s). Can be a single string ID, comma separated string, or list. Long lists are
+            split across several requests.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(ids, list):
-        ids = ','.join(ids)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/playerStatsheets?ids={ids}')
-    return {s['id']: s for s in check_network_response(res)}
+    return _get_by_ids(f'{BASE_URL}/database/playerStatsheets', ids, cache_time)
 
 
 def get_season_statsheets(ids, cache_time=5):
@@ -357,14 +361,11 @@ def get_team_statsheets(ids, cache_time=5):
     Get statsheets for a team by statsheet ID
 
     Args:
-        id: team statsheet ID(s). Can be a single string ID, comma separated string, or list.
+        id: team statsheet ID(s). Can be a single string ID, comma separated string, or list. Long lists are
+            split across several requests.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(ids, list):
-        ids = ','.join(ids)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/teamStatsheets?ids={ids}')
-    return {s['id']: s for s in check_network_response(res)}
+    return _get_by_ids(f'{BASE_URL}/database/teamStatsheets', ids, cache_time)
 
 
 def get_tributes(*, cache_time=5):
@@ -464,12 +465,73 @@ def get_coffee(ids, cache_time=5):
     return check_network_response(res)
 
 
-def get_feed_global(limit=50, sort=None, category=None, start=None, type_=None, season=None, sim=None, season_start=None, season_end=None, cache_time=5):
+def _paged_feed(url, params, limit, page_size, cache_time):
+    """
+    Generator over a feed endpoint, using the `created` timestamp of the last item of each page as the `start`
+    cursor for the next one. The next page is requested in the background while the current one is consumed.
+
+    If a whole page shares the cursor timestamp, the page is requested again with a larger `limit` until it gets past
+    that timestamp. Arguments are checked when this is called rather than on first iteration.
+    """
+    if params.get("sort") == 1:
+        raise ValueError("Lazy feed paging only supports newest to oldest order (sort=0)")
+    if page_size < 1:
+        raise ValueError("Page size must be at least 1")
+    return _feed_pages(url, params, limit, page_size, cache_time)
+
+
+def _feed_pages(url, params, limit, page_size, cache_time):
+    s = session(cache_time)
+    start = params.pop("start", None)
+    remaining = None if limit is None or limit < 0 else limit
+
+    def fetch(cursor, size):
+        page_params = dict(params, limit=size)
+        if cursor is not None:
+            page_params["start"] = cursor
+        return check_network_response(s.get(url, params=page_params))
+
+    # IDs of items sharing the cursor timestamp, since the next page starts with them again
+    boundary_ids = set()
+    page_limit = page_size
+    with ContextThreadPoolExecutor(max_workers=1) as executor:
+        page = fetch(start, page_limit)
+        while page and remaining != 0:
+            is_full = len(page) >= page_limit
+            new_items = [x for x in page if x["id"] not in boundary_ids]
+            if not new_items:
+                if not is_full:
+                    break
+                page_limit *= 2
+                page = fetch(start, page_limit)
+                continue
+
+            next_start = page[-1]["created"]
+            if next_start != start:
+                boundary_ids = set()
+                page_limit = page_size
+            boundary_ids.update(x["id"] for x in page if x["created"] == next_start)
+            start = next_start
+            next_page = executor.submit(fetch, start, page_limit) if is_full else None
+
+            if remaining is not None:
+                new_items = new_items[:remaining]
+                remaining -= len(new_items)
+            yield from new_items
+
+            if next_page is None or remaining == 0:
+                if next_page is not None:
+                    next_page.cancel()
+                break
+            page = next_page.result()
+
+
+def get_feed_global(limit=50, sort=None, category=None, start=None, type_=None, season=None, sim=None, season_start=None, season_end=None, cache_time=5, lazy=False, page_size=100):
     """
     Get Global Feed
 
     Args:
-        limit: Number of entries to return
+        limit: Number of entries to return. If `lazy`, this is the total across all pages, `None` for everything
         sort: 0 - Newest to Oldest, 1 - Oldest to Newest
         category: 0 - Game, 1 - Changes, 2 - Abilities, 3 - Outcomes, 4 - Narrative
         start: timestamp
@@ -479,6 +541,9 @@ def get_feed_global(limit=50, sort=None, category=None, start=None, type_=None,
         season_start: return items after this season (inclusive)
         season_end: return items before this season (inclusive)
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
+        lazy: return a generator that pages through the feed using `start` as a cursor, rather than a list. Only
+            supported for newest to oldest order
+        page_size: number of entries to get per-page when `lazy`
     """
     if isinstance(start, datetime):
         start = start.strftime(TIMESTAMP_FORMAT)
@@ -501,18 +566,21 @@ def get_feed_global(limit=50, sort=None, category=None, start=None, type_=None,
     if season_end is not None:
         params["seasonEnd"] = season_end - 1
 
+    if lazy:
+        return _paged_feed(f'{BASE_URL}/database/feed/global', params, limit, page_size, cache_time)
+
     s = session(cache_time)
     res = s.get(f'{BASE_URL}/database/feed/global', params=params)
     return check_network_response(res)
 
 
-def get_feed_game(id_, limit=50, sort=None, category=None, start=None, type_=None, sim=None, season_start=None, season_end=None, cache_time=5):
+def get_feed_game(id_, limit=50, sort=None, category=None, start=None, type_=None, sim=None, season_start=None, season_end=None, cache_time=5, lazy=False, page_size=100):
     """
     Get Game Feed
 
     Args:
         id_: Game ID
-        limit: Number of entries to return
+        limit: Number of entries to return. If `lazy`, this is the total across all pages, `None` for everything
         sort: 0 - Newest to Oldest, 1 - Oldest to Newest
         category: 0 - Game, 1 - Changes, 2 - Abilities, 3 - Outcomes, 4 - Narrative
         start: timestamp
@@ -521,6 +589,9 @@ def get_feed_game(id_, limit=50, sort=None, category=None, start=None, type_=Non
         season_start: return items after this season (inclusive)
         season_end: return items before this season (inclusive)
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
+        lazy: return a generator that pages through the feed using `start` as a cursor, rather than a list. Only
+            supported for newest to oldest order
+        page_size: number of entries to get per-page when `lazy`
     """
     if isinstance(start, datetime):
         start = start.strftime(TIMESTAMP_FORMAT)
@@ -541,18 +612,21 @@ def get_feed_game(id_, limit=50, sort=None, category=None, start=None, type_=Non
     if season_end is not None:
         params["seasonEnd"] = season_end - 1
 
+    if lazy:
+        return _paged_feed(f'{BASE_URL}/database/feed/game', params, limit, page_size, cache_time)
+
     s = session(cache_time)
     res = s.get(f'{BASE_URL}/database/feed/game', params=params)
     return check_network_response(res)
 
 
-def get_feed_team(id_, limit=50, sort=None, category=None, start=None, type_=None, season=None, sim=None, season_start=None, season_end=None, cache_time=5):
+def get_feed_team(id_, limit=50, sort=None, category=None, start=None, type_=None, season=None, sim=None, season_start=None, season_end=None, cache_time=5, lazy=False, page_size=100):
     """
     Get Team Feed
 
     Args:
         id_: Team ID
-        limit: Number of entries to return
+        limit: Number of entries to return. If `lazy`, this is the total across all pages, `None` for everything
         sort: 0 - Newest to Oldest, 1 - Oldest to Newest
         category: 0 - Game, 1 - Changes, 2 - Abilities, 3 - Outcomes, 4 - Narrative
         start: timestamp
@@ -562,6 +636,9 @@ def get_feed_team(id_, limit=50, sort=None, category=None, start=None, type_=Non
         season_start: return items after this season (inclusive)
         season_end: return items before this season (inclusive)
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
+        lazy: return a generator that pages through the feed using `start` as a cursor, rather than a list. Only
+            supported for newest to oldest order
+        page_size: number of entries to get per-page when `lazy`
     """
     if isinstance(start, datetime):
         start = start.strftime(TIMESTAMP_FORMAT)
@@ -584,18 +661,21 @@ def get_feed_team(id_, limit=50, sort=None, category=None, start=None, type_=Non
     if season_end is not None:
         params["seasonEnd"] = season_end - 1
 
+    if lazy:
+        return _paged_feed(f'{BASE_URL}/database/feed/team', params, limit, page_size, cache_time)
+
     s = session(cache_time)
     res = s.get(f'{BASE_URL}/database/feed/team', params=params)
     return check_network_response(res)
 
 
-def get_feed_player(id_, limit=50, sort=None, category=None, start=None, type_=None, season=None, sim=None, season_start=None, season_end=None,  cache_time=5):
+def get_feed_player(id_, limit=50, sort=None, category=None, start=None, type_=None, season=None, sim=None, season_start=None, season_end=None,  cache_time=5, lazy=False, page_size=100):
     """
     Get Player Feed
 
     Args:
         id_: Player ID
-        limit: Number of entries to return
+        limit: Number of entries to return. If `lazy`, this is the total across all pages, `None` for everything
         sort: 0 - Newest to Oldest, 1 - Oldest to Newest
         category: 0 - Game, 1 - Changes, 2 - Abilities, 3 - Outcomes, 4 - Narrative
         start: timestamp
@@ -605,6 +685,9 @@ def get_feed_player(id_, limit=50, sort=None, category=None, start=None, type_=N
         season_start: return items after this season (inclusive)
         season_end: return items before this season (inclusive)
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
+        lazy: return a generator that pages through the feed using `start` as a cursor, rather than a list. Only
+            supported for newest to oldest order
+        page_size: number of entries to get per-page when `lazy`
     """
     if isinstance(start, datetime):
         start = start.strftime(TIMESTAMP_FORMAT)
@@ -627,6 +710,9 @@ def get_feed_player(id_, limit=50, sort=None, category=None, start=None, type_=N
     if season_end is not None:
         params["seasonEnd"] = season_end - 1
 
+    if lazy:
+        return _paged_feed(f'{BASE_URL}/database/feed/player', params, limit, page_size, cache_time)
+
     s = session(cache_time)
     res = s.get(f'{BASE_URL}/database/feed/player', params=params)
     return check_network_response(res)
@@ -3,20 +3,33 @@ Wrappers for eventually API for feed events
 
 https://alisww.github.io/eventually
 """
+import time
+from collections import deque
 
-from blaseball_mike.session import session, check_network_response
+from blaseball_mike.session import session, check_network_response, ContextThreadPoolExecutor
 
 BASE_URL = 'https://api.sibr.dev/eventually/v2'
 
 
-def search(cache_time=5, limit=100, query={}, batch_size=100):
+def search(cache_time=5, limit=100, query={}, batch_size=100, workers=1, adaptive=False, max_batch_size=1000,
+           target_latency=1.0):
     """
     Search through feed events.
     Set limit to -1 to get everything.
     batch_size controls how many events are fetched at once; defaults to 100.
     Returns a generator that only gets the following page when needed.
     Possible parameters for query: https://alisww.github.io/eventually/#/default/events
+
+    Setting workers above 1 requests that many pages concurrently, reading ahead of the consumer while still
+    yielding events in order. In that mode, no more than `limit` events are returned, and `adaptive` grows
+    `batch_size` (up to `max_batch_size`) while pages come back faster than `target_latency` seconds and shrinks
+    it when they are slower.
     """
+    if workers > 1:
+        yield from _search_parallel(cache_time, limit, query, batch_size, workers, adaptive, max_batch_size,
+                                    target_latency)
+        return
+
     s = session(cache_time)
 
     res_len = 0
@@ -30,3 +43,42 @@ def search(cache_time=5, limit=100, query={}, batch_size=100):
         else:
             res_len += out_len
             yield from out
+
+
+def _search_parallel(cache_time, limit, query, batch_size, workers, adaptive, max_batch_size, target_latency):
+    s = session(cache_time)
+    min_batch_size = min(batch_size, 10)
+
+    def fetch(offset, count):
+        start = time.monotonic()
+        out = check_network_response(s.get(f"{BASE_URL}/events", params={'offset': offset, 'limit': count, **query}))
+        return out, time.monotonic() - start
+
+    # Offsets are known ahead of time, so keep a window of `workers` pages in flight
+    pending = deque()
+    next_offset = 0
+    with ContextThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            while True:
+                while len(pending) < workers and (limit == -1 or next_offset < limit):
+                    count = batch_size if limit == -1 else min(batch_size, limit - next_offset)
+                    pending.append((count, executor.submit(fetch, next_offset, count)))
+                    next_offset += count
+
+                if not pending:
+                    break
+
+                count, future = pending.popleft()
+                out, elapsed = future.result()
+                yield from out
+                if len(out) < count:
+                    break
+
+                if adaptive:
+                    if elapsed < target_latency / 2:
+                        batch_size = min(batch_size * 2, max_batch_size)
+                    elif elapsed > target_latency * 2:
+                        batch_size = max(batch_size // 2, min_batch_size)
+        finally:
+            for _, future in pending:
+                future.cancel()
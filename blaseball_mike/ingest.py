@@ -0,0 +1,128 @@
+"""
+Incremental ingestion of Chronicler game updates.
+
+`GameUpdateIngestor` remembers how far it has read for every game, so a long-running consumer only downloads
+updates it has not seen before and never emits the same update twice, even across restarts.
+"""
+import json
+import os
+import time
+from datetime import timedelta
+
+from . import chronicler
+from .session import TIMESTAMP_FORMAT
+from .utils import parse_timestamp
+
+
+class GameUpdateIngestor:
+    """
+    Tracks a high-watermark per (season, game) and pulls only new game updates from Chronicler.
+
+    Args:
+        season: 1-indexed season to follow.
+        tournament: tournament identifier to follow, instead of a season.
+        game_ids: list or comma-separated string of game IDs to follow.
+        state_path: JSON file used to persist watermarks between runs. If `None`, watermarks only live in memory.
+        page_size: number of updates to get per-page.
+
+    Updates are emitted exactly as returned by `blaseball_mike.chronicler.get_game_updates`, oldest first.
+    """
+
+    def __init__(self, season=None, tournament=None, game_ids=None, state_path=None, page_size=1000):
+        if season is not None and tournament is not None:
+            raise ValueError("Cannot set both Season and Tournament")
+
+        self.season = season
+        self.tournament = tournament
+        self.game_ids = game_ids
+        self.state_path = state_path
+        self.page_size = page_size
+
+        # Timestamp of the newest update emitted. The next poll starts just before it, as Chronicler's `after` is
+        # exclusive and more updates with this same timestamp may not have been returned yet
+        self.cursor = None
+        # "<season>/<game ID>" -> {"timestamp": newest timestamp, "hashes": hashes seen at that timestamp}
+        self.watermarks = {}
+        self.load_state()
+
+    @staticmethod
+    def _key(update):
+        return f"{update['data'].get('season', -1) + 1}/{update['gameId']}"
+
+    def watermark(self, season, game_id):
+        """Returns the timestamp of the newest update seen for a game, or `None`. Season is 1-indexed."""
+        mark = self.watermarks.get(f"{season}/{game_id}")
+        return mark["timestamp"] if mark else None
+
+    def load_state(self):
+        """Read watermarks from `state_path`, if it exists"""
+        if self.state_path is None or not os.path.exists(self.state_path):
+            return
+        with open(self.state_path, "r") as f:
+            state = json.load(f)
+        self.cursor = state.get("cursor")
+        self.watermarks = state.get("games", {})
+
+    def save_state(self):
+        """Write watermarks to `state_path`, replacing the file atomically"""
+        if self.state_path is None:
+            return
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"cursor": self.cursor, "games": self.watermarks}, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _after(self):
+        # One tick (a millisecond) before the cursor, so updates sharing its timestamp are fetched again and the
+        # per-game watermarks drop the ones already emitted
+        if self.cursor is None:
+            return None
+        return (parse_timestamp(self.cursor) - timedelta(milliseconds=1)).strftime(TIMESTAMP_FORMAT)
+
+    def _is_new(self, update):
+        # Timestamps are compared parsed, since Chronicler does not always give the same number of fraction digits
+        mark = self.watermarks.get(self._key(update))
+        if mark is None:
+            return True
+        timestamp, mark_timestamp = parse_timestamp(update["timestamp"]), parse_timestamp(mark["timestamp"])
+        if timestamp != mark_timestamp:
+            return timestamp > mark_timestamp
+        return update["hash"] not in mark["hashes"]
+
+    def _advance(self, update):
+        # Only hashes at the newest timestamp are needed to spot duplicates, so they are dropped once it moves on
+        key = self._key(update)
+        timestamp = parse_timestamp(update["timestamp"])
+        mark = self.watermarks.get(key)
+        if mark is None or timestamp > parse_timestamp(mark["timestamp"]):
+            self.watermarks[key] = {"timestamp": update["timestamp"], "hashes": [update["hash"]]}
+        elif update["hash"] not in mark["hashes"]:
+            mark["hashes"].append(update["hash"])
+
+        if self.cursor is None or timestamp > parse_timestamp(self.cursor):
+            self.cursor = update["timestamp"]
+
+    def poll(self):
+        """
+        Generator of every update newer than the stored watermarks. Watermarks are advanced as updates are
+        emitted and saved once the generator finishes or is closed.
+        """
+        updates = chronicler.get_game_updates(season=self.season, tournament=self.tournament,
+                                              game_ids=self.game_ids, order="asc", after=self._after(),
+                                              page_size=self.page_size, lazy=True, cache_time=0)
+        try:
+            for update in updates:
+                if not self._is_new(update):
+                    continue
+                self._advance(update)
+                yield update
+        finally:
+            self.save_state()
+
+    def stream(self, interval=5):
+        """
+        Infinite generator of new updates, polling Chronicler every `interval` seconds.
+        """
+        while True:
+            yield from self.poll()
+            time.sleep(interval)
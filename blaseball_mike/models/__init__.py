@@ -8,22 +8,44 @@ known API response has a respective object, found in one of the included sub-mod
 .. include:: ../../docs/examples.md
 
 """
+import importlib
 
-from .base import *
-from .player import *
-from .team import *
-from .game import *
-from .fight import *
-from .item import *
-from .modification import *
-from .season import *
-from .league import *
-from .election import *
-from .playoff import *
-from .leaderboard import *
-from .statsheet import *
-from .simulation_data import *
-from .global_event import *
-from .feed import *
-from .stadium import *
-from .weather import *
+# Sub-modules are only imported when one of their models is first used, see `__getattr__`
+_MODELS_BY_MODULE = {
+    "base": ("Base",),
+    "player": ("Player",),
+    "team": ("Team",),
+    "game": ("Game",),
+    "game_sim": ("SimulationResult", "GameSimulator"),
+    "fight": ("Fight",),
+    "item": ("Item",),
+    "modification": ("Modification",),
+    "season": ("Season", "Standings", "SeasonBundle"),
+    "league": ("League", "Subleague", "Division", "Tiebreaker"),
+    "election": ("Election", "OffseasonSetup", "Decree", "Blessing", "Will", "Gift", "ElectionResult",
+                 "OffseasonResult", "DecreeResult", "BlessingResult", "BonusResult", "TidingResult", "EventResult"),
+    "playoff": ("Playoff", "PlayoffRound", "PlayoffMatchup"),
+    "leaderboard": ("Idol", "Tribute"),
+    "statsheet": ("PlayerStatsheet", "TeamStatsheet", "GameStatsheet", "SeasonStatsheet", "StatsheetTable"),
+    "simulation_data": ("SimulationData",),
+    "global_event": ("GlobalEvent",),
+    "feed": ("Feed", "FeedEvent"),
+    "stadium": ("Stadium", "Renovation"),
+    "weather": ("Weather",),
+}
+_MODULE_BY_NAME = {name: module for module, names in _MODELS_BY_MODULE.items() for name in names}
+
+__all__ = list(_MODULE_BY_NAME)
+
+
+def __getattr__(name):
+    module = _MODULE_BY_NAME.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
@@ -1,7 +1,10 @@
 import abc
 import functools
+import inspect
 import re
 
+from .. import session, tracing
+
 
 class _LazyLoadDecorator:
 
@@ -42,11 +45,24 @@ class _LazyLoadDecorator:
             if cache:
                 return cache
 
-        value = self.func(obj)
+        if session._REQUEST_HOOKS or tracing._EXPORTERS:
+            value = self._instrumented_call(obj)
+        else:
+            value = self.func(obj)
         if self.cache_name:
             setattr(obj, self.cache_name, value)
         return value
 
+    def _instrumented_call(self, obj):
+        # Attribute any requests made while computing the value to this attribute, and trace it if tracing is on
+        name = f"{type(obj).__name__}.{self.name}"
+        token = session._REQUEST_CALLER.set(name)
+        try:
+            with tracing.span(name, "lazy_load"):
+                return self.func(obj)
+        finally:
+            session._REQUEST_CALLER.reset(token)
+
     def __set__(self, obj, value):
         setattr(obj, self.original_name, value)
 
@@ -73,6 +89,14 @@ class Base(abc.ABC):
 
     _camel_to_snake_re = re.compile(r'(?<!^)(?=[A-Z])')
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Time every `load*` classmethod while tracing is on, see `blaseball_mike.tracing`
+        for name, value in list(vars(cls).items()):
+            if name.startswith("load") and isinstance(value, classmethod) \
+                    and not inspect.isgeneratorfunction(value.__func__):
+                setattr(cls, name, classmethod(tracing.traced(value.__func__)))
+
     def __init__(self, data, strict=False):
         self.fields = []
         self.key_transform_lookup = {}
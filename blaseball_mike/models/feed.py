@@ -1,10 +1,13 @@
-from dateutil.parser import parse
+import sys
+
+import ujson
 
 from .base import Base
 from .player import Player
 from .team import Team
 from .game import Game
-from .. import database
+from .. import database, eventually
+from ..utils import parse_timestamp
 
 
 class Feed(Base):
@@ -19,33 +22,46 @@ class Feed(Base):
         return [cls._from_api_conversion(x) for x in p[0].fields]
 
     @classmethod
-    def load(cls, count=50, order=None, category=None, start_time=None, type_id=None, season=None, sim=None):
-        """Returns a list of feed items"""
+    def load(cls, count=50, order=None, category=None, start_time=None, type_id=None, season=None, sim=None,
+             lazy=False):
+        """
+        Returns a list of feed items.
+
+        If `lazy`, returns a generator that keeps paging through the feed until `count` items have been returned
+        (or everything, if `count` is `None`).
+        """
         entries = database.get_feed_global(limit=count, sort=order, category=category,
-                                           start=start_time, type_=type_id, season=season, sim=sim)
-        return [cls(entry) for entry in entries]
+                                           start=start_time, type_=type_id, season=season, sim=sim, lazy=lazy)
+        return cls._from_entries(entries, lazy)
 
     @classmethod
     def load_by_player(cls, player_id, count=50, order=None, category=None, start_time=None, type_id=None, season=None,
-                       sim=None):
-        """Returns a list of feed items filtered by player"""
+                       sim=None, lazy=False):
+        """Returns a list of feed items filtered by player. See `Feed.load` for `lazy`"""
         entries = database.get_feed_player(player_id, limit=count, sort=order, category=category,
-                                           start=start_time, type_=type_id, season=season, sim=sim)
-        return [cls(entry) for entry in entries]
+                                           start=start_time, type_=type_id, season=season, sim=sim, lazy=lazy)
+        return cls._from_entries(entries, lazy)
 
     @classmethod
     def load_by_team(cls, team_id, count=50, order=None, category=None, start_time=None, type_id=None, season=None,
-                     sim=None):
-        """Returns a list of feed items filtered by team"""
+                     sim=None, lazy=False):
+        """Returns a list of feed items filtered by team. See `Feed.load` for `lazy`"""
         entries = database.get_feed_team(team_id, limit=count, sort=order, category=category,
-                                         start=start_time, type_=type_id, season=season, sim=sim)
-        return [cls(entry) for entry in entries]
+                                         start=start_time, type_=type_id, season=season, sim=sim, lazy=lazy)
+        return cls._from_entries(entries, lazy)
 
     @classmethod
-    def load_by_game(cls, game_id, count=50, order=None, category=None, start_time=None, type_id=None, sim=None):
-        """Returns a list of feed items filtered by game"""
+    def load_by_game(cls, game_id, count=50, order=None, category=None, start_time=None, type_id=None, sim=None,
+                     lazy=False):
+        """Returns a list of feed items filtered by game. See `Feed.load` for `lazy`"""
         entries = database.get_feed_game(game_id, limit=count, sort=order, category=category,
-                                         start=start_time, type_=type_id, sim=sim)
+                                         start=start_time, type_=type_id, sim=sim, lazy=lazy)
+        return cls._from_entries(entries, lazy)
+
+    @classmethod
+    def _from_entries(cls, entries, lazy):
+        if lazy:
+            return (cls(entry) for entry in entries)
         return [cls(entry) for entry in entries]
 
     @classmethod
@@ -56,7 +72,7 @@ class Feed(Base):
 
     @Base.lazy_load("_created", use_default=False)
     def created(self):
-        return parse(self._created)
+        return parse_timestamp(self._created)
 
     @Base.lazy_load("_season", use_default=False)
     def season(self):
@@ -86,3 +102,176 @@ class Feed(Base):
         for game in self._game_tag_ids:
             games.append(Game.load_by_id(game))
         return games
+
+    @classmethod
+    def resolve_tags(cls, feed_items):
+        """
+        Load the tagged players, teams and games of every item in a list of feed items at once, filling in the
+        `player_tags`, `team_tags` and `game_tags` of each item.
+
+        Players are requested together, teams come from a single `Team.load_all`, and games are loaded one day
+        at a time using the season and day of the items that tag them. Anything not found that way is loaded
+        individually, and players that still can't be found are `None`.
+        """
+        feed_items = list(feed_items)
+        player_ids, team_ids, game_days = set(), set(), {}
+        for item in feed_items:
+            player_ids.update(getattr(item, "_player_tag_ids", None) or [])
+            team_ids.update(getattr(item, "_team_tag_ids", None) or [])
+            game_tag_ids = getattr(item, "_game_tag_ids", None) or []
+            if not game_tag_ids:
+                continue
+            # Tournament games are not part of the regular season schedule
+            day = None
+            if getattr(item, "tournament", -1) == -1 and getattr(item, "_season", None) is not None \
+                    and getattr(item, "_day", None) is not None:
+                day = (item.season, item.day)
+            for game_id in game_tag_ids:
+                game_days.setdefault(game_id, day)
+
+        players = Player.load(*player_ids) if player_ids else {}
+        for player_id in player_ids - set(players):
+            players[player_id] = Player.load_one(player_id)
+
+        teams = Team.load_all() if team_ids else {}
+        for team_id in team_ids - set(teams):
+            teams[team_id] = Team.load(team_id)
+
+        games = {}
+        for season, day in {day for day in game_days.values() if day is not None}:
+            games.update(Game.load_by_day(season, day))
+        for game_id in set(game_days) - set(games):
+            games[game_id] = Game.load_by_id(game_id)
+
+        for item in feed_items:
+            item._player_tags = [players[id_] for id_ in getattr(item, "_player_tag_ids", None) or []]
+            item._team_tags = [teams[id_] for id_ in getattr(item, "_team_tag_ids", None) or []]
+            item._game_tags = [games[id_] for id_ in getattr(item, "_game_tag_ids", None) or []]
+        return feed_items
+
+
+class FeedEvent:
+    """
+    Compact representation of a single Feed item, for holding large amounts of feed history in memory.
+
+    Unlike `Feed` this does not convert every key into an attribute: known fields are stored in slots, repeated tag
+    IDs are interned so they are only held in memory once, and `created` is only parsed when accessed. `metadata`
+    is decoded on first access if the source provided it as a JSON string (ie data read back from an export), and
+    `json` returns it as it was given. Events are equal if their `json` is, and hash by ID.
+    Use `to_feed` to get a full `Feed` model, for example to resolve tags.
+    """
+    __slots__ = ("id", "type", "category", "tournament", "phase", "description", "nuts", "player_tag_ids",
+                 "team_tag_ids", "game_tag_ids", "_season", "_day", "_created", "_created_parsed", "_metadata",
+                 "_metadata_parsed", "_keys", "_extra")
+
+    _FIELDS = ("id", "playerTags", "teamTags", "gameTags", "metadata", "created", "season", "tournament", "type",
+               "day", "phase", "category", "description", "nuts")
+    # Items from the same source share their key layout, so store each distinct layout once. Capped, so data with
+    # ever-changing keys keeps its own layout per item instead of growing this forever
+    _KEY_LAYOUTS = {}
+    _MAX_KEY_LAYOUTS = 64
+
+    def __init__(self, data):
+        self.id = data.get("id")
+        self.type = data.get("type")
+        self.category = data.get("category")
+        self.tournament = data.get("tournament")
+        self.phase = data.get("phase")
+        self.description = data.get("description")
+        self.nuts = data.get("nuts")
+        self.player_tag_ids = self._intern_ids(data.get("playerTags"))
+        self.team_tag_ids = self._intern_ids(data.get("teamTags"))
+        self.game_tag_ids = self._intern_ids(data.get("gameTags"))
+        self._season = data.get("season")
+        self._day = data.get("day")
+        self._created = data.get("created")
+        self._created_parsed = None
+        self._metadata = data.get("metadata")
+        self._metadata_parsed = None
+        keys = tuple(data)
+        if len(self._KEY_LAYOUTS) < self._MAX_KEY_LAYOUTS:
+            keys = self._KEY_LAYOUTS.setdefault(keys, keys)
+        else:
+            keys = self._KEY_LAYOUTS.get(keys, keys)
+        self._keys = keys
+        self._extra = {k: v for k, v in data.items() if k not in self._FIELDS} or None
+
+    @staticmethod
+    def _intern_ids(ids):
+        if ids is None:
+            return None
+        return tuple(sys.intern(x) for x in ids)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.id}>"
+
+    def __eq__(self, other):
+        if isinstance(other, type(self)):
+            return self.json() == other.json()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.id)
+
+    @classmethod
+    def from_list(cls, entries):
+        """Convert a list of raw feed items, ie from `database.get_feed_global` or `eventually.search`"""
+        return [cls(entry) for entry in entries]
+
+    @classmethod
+    def search(cls, limit=100, query={}, **kwargs):
+        """
+        Generator of `FeedEvent` from `blaseball_mike.eventually.search`. Extra keyword arguments are passed through.
+        """
+        for entry in eventually.search(limit=limit, query=query, **kwargs):
+            yield cls(entry)
+
+    @property
+    def season(self):
+        return self._season + 1 if self._season is not None else None
+
+    @property
+    def day(self):
+        return self._day + 1 if self._day is not None else None
+
+    @property
+    def created(self):
+        if self._created_parsed is None and self._created:
+            self._created_parsed = parse_timestamp(self._created)
+        return self._created_parsed
+
+    @property
+    def metadata(self):
+        if not isinstance(self._metadata, (str, bytes)):
+            return self._metadata
+        if self._metadata_parsed is None:
+            self._metadata_parsed = ujson.loads(self._metadata)
+        return self._metadata_parsed
+
+    def json(self):
+        """Returns dictionary of fields used to generate the original object"""
+        known = {
+            "id": self.id,
+            "playerTags": self.player_tag_ids,
+            "teamTags": self.team_tag_ids,
+            "gameTags": self.game_tag_ids,
+            "metadata": self._metadata,
+            "created": self._created,
+            "season": self._season,
+            "tournament": self.tournament,
+            "type": self.type,
+            "day": self._day,
+            "phase": self.phase,
+            "category": self.category,
+            "description": self.description,
+            "nuts": self.nuts,
+        }
+        data = {}
+        for key in self._keys:
+            value = known[key] if key in known else self._extra[key]
+            data[key] = list(value) if isinstance(value, tuple) else value
+        return data
+
+    def to_feed(self):
+        """Returns this item as a full `Feed` model"""
+        return Feed(dict(self.json(), metadata=self.metadata))
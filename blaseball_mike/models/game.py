@@ -1,3 +1,5 @@
+from concurrent.futures import as_completed
+
 from .base import Base
 from .modification import Modification
 from .player import Player
@@ -6,6 +8,7 @@ from .team import Team
 from .stadium import Stadium
 from .weather import Weather
 from .. import database, chronicler
+from ..session import ContextThreadPoolExecutor
 
 
 class Game(Base):
@@ -34,6 +37,27 @@ class Game(Base):
             if not sim or game.get('sim', sim) == sim
         }
 
+    @classmethod
+    def load_by_days(cls, season, days, sim=None, workers=8):
+        """
+        Load several in-game days of a season concurrently. Season and Days are 1-indexed.
+
+        Returns a generator of `(day, games)` tuples in the order the days finish loading, where `games` is the same
+        dictionary `load_by_day` returns. At most `workers` days are requested at once.
+        """
+        def load_day(day):
+            return day, cls.load_by_day(season, day, sim=sim)
+
+        executor = ContextThreadPoolExecutor(max_workers=workers)
+        futures = [executor.submit(load_day, day) for day in days]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
     @classmethod
     def load_tournament_by_day(cls, tournament, day):
         """
@@ -246,31 +270,56 @@ class Game(Base):
         return Modification.load_one(getattr(self, "_away_batter_mod_id", None))
 
     @staticmethod
-    def _payout_calc_discipline(odds, amount):
+    def _payout_multiplier_discipline(odds):
         if odds == 0.5:
-            return round(2 * amount)
+            return 2
         elif odds < 0.5:
-            return round(amount * (2 + 0.000555 * (100 * (0.5 - odds)) ** 2.4135))
+            return 2 + 0.000555 * (100 * (0.5 - odds)) ** 2.4135
         else:
-            return round(amount * (2 - 0.000335 * (100 * (odds - 0.5)) ** 2.045))
+            return 2 - 0.000335 * (100 * (odds - 0.5)) ** 2.045
 
     @staticmethod
-    def _payout_calc_s12(odds, amount):
+    def _payout_multiplier_s12(odds):
         if odds == 0.5:
-            return round(2 * amount)
+            return 2
         elif odds < 0.5:
-            return round(amount * (2 + 0.0015 * (100 * (0.5 - odds)) ** 2.2))
+            return 2 + 0.0015 * (100 * (0.5 - odds)) ** 2.2
         else:
-            return round(amount * (0.571 + 1.429 / (1 + (3 * (odds - 0.5)) ** 0.77)))
+            return 0.571 + 1.429 / (1 + (3 * (odds - 0.5)) ** 0.77)
 
     @staticmethod
-    def _payout_calc(odds, amount):
+    def _payout_multiplier(odds):
         if odds == 0.5:
-            return round(2 * amount)
+            return 2
         elif odds < 0.5:
-            return round(amount * (2 + 0.0015 * (100 * (0.5 - odds)) ** 2.2))
+            return 2 + 0.0015 * (100 * (0.5 - odds)) ** 2.2
         else:
-            return round(amount * (3.206 / (1 + ((0.443 * (odds - 0.5)) ** 0.95)) - 1.206))
+            return 3.206 / (1 + ((0.443 * (odds - 0.5)) ** 0.95)) - 1.206
+
+    @classmethod
+    def _payout_formula(cls, season):
+        if season < 12:
+            return cls._payout_multiplier_discipline
+        elif season == 12:
+            return cls._payout_multiplier_s12
+        else:
+            return cls._payout_multiplier
+
+    @classmethod
+    def _payout_multiplier_for_season(cls, odds, season):
+        return cls._payout_formula(season)(odds)
+
+    @classmethod
+    def _payout_calc_discipline(cls, odds, amount):
+        return round(amount * cls._payout_multiplier_discipline(odds))
+
+    @classmethod
+    def _payout_calc_s12(cls, odds, amount):
+        return round(amount * cls._payout_multiplier_s12(odds))
+
+    @classmethod
+    def _payout_calc(cls, odds, amount):
+        return round(amount * cls._payout_multiplier(odds))
 
     def home_payout(self, bet, season=None):
         """
@@ -278,13 +327,7 @@ class Game(Base):
         """
         if season is None:
             season = self.season
-
-        if season < 12:
-            return self._payout_calc_discipline(self.home_odds, bet)
-        elif season == 12:
-            return self._payout_calc_s12(self.home_odds, bet)
-        else:
-            return self._payout_calc(self.home_odds, bet)
+        return round(bet * self._payout_multiplier_for_season(self.home_odds, season))
 
     def away_payout(self, bet, season=None):
         """
@@ -292,10 +335,52 @@ class Game(Base):
         """
         if season is None:
             season = self.season
+        return round(bet * self._payout_multiplier_for_season(self.away_odds, season))
 
-        if season < 12:
-            return self._payout_calc_discipline(self.away_odds, bet)
-        elif season == 12:
-            return self._payout_calc_s12(self.away_odds, bet)
-        else:
-            return self._payout_calc(self.away_odds, bet)
+    @classmethod
+    def payout_table(cls, games, bets, season=None, seasons=None):
+        """
+        Calculate payouts and expected values for every game and bet size at once, optionally under several
+        seasons' payout formulas.
+
+        Each payout formula only depends on the odds, so it is evaluated once per team per game per formula and then
+        applied to every bet size. Seasons sharing a formula (ie every season before 12) share its results.
+
+        Args:
+            games: iterable of `Game`, or dictionary of `Game` keyed by game ID (as returned by `load_by_day`).
+            bets: list of bet amounts.
+            season: 1-indexed season whose payout formula to use. If `None`, use each game's own season.
+            seasons: list of 1-indexed seasons whose payout formulas to compare. Cannot be used with `season`.
+
+        Returns dictionary keyed by game ID of dictionaries containing lists, in the same order as `bets`, of
+        `home_payouts` / `away_payouts` (what a winning bet returns) and `home_expected` / `away_expected` (the
+        expected profit of the bet given the team's odds). If `seasons` is set, returns a dictionary keyed by season
+        of such tables instead.
+        """
+        if season is not None and seasons is not None:
+            raise ValueError("Cannot set both season and seasons")
+        if isinstance(games, dict):
+            games = games.values()
+        games = list(games)
+        bets = list(bets)
+        # (formula, odds) -> multiplier
+        multipliers = {}
+
+        def build(season_of):
+            table = {}
+            for game in games:
+                formula = cls._payout_formula(season_of(game))
+                row = {}
+                for side, odds in (("home", game.home_odds), ("away", game.away_odds)):
+                    if (formula, odds) not in multipliers:
+                        multipliers[formula, odds] = formula(odds)
+                    multiplier = multipliers[formula, odds]
+                    payouts = [round(bet * multiplier) for bet in bets]
+                    row[f"{side}_payouts"] = payouts
+                    row[f"{side}_expected"] = [odds * payout - bet for payout, bet in zip(payouts, bets)]
+                table[game.id] = row
+            return table
+
+        if seasons is not None:
+            return {x: build(lambda game, x=x: x) for x in seasons}
+        return build(lambda game: game.season if season is None else season)
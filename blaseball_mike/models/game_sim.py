@@ -0,0 +1,204 @@
+import random
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+SimulationResult = namedtuple("SimulationResult", ["simulations", "home_wins", "away_wins", "ties",
+                                                   "home_win_probability", "away_win_probability",
+                                                   "home_runs", "away_runs"])
+SimulationResult.__doc__ = """
+Outcome of a batch of simulated games. `home_runs` and `away_runs` are dictionaries of final score to number of
+games ending with that score.
+"""
+
+# Share of times on base that end up as each outcome, before the batter's power is taken into account
+_ON_BASE_OUTCOMES = (("walk", 0.25), ("single", 0.50), ("double", 0.13), ("triple", 0.02), ("home_run", 0.10))
+_HIT_BASES = {"walk": 1, "single": 1, "double": 2, "triple": 3, "home_run": 4}
+
+
+def _clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+def _team_ratings(lineup, pitcher):
+    lineup = [p for p in lineup if p is not None]
+    if not lineup:
+        raise ValueError("Cannot simulate a team without a lineup")
+    if pitcher is None:
+        raise ValueError("Cannot simulate a team without a pitcher")
+    return {
+        "batting": [p.get_hitting_rating() for p in lineup],
+        "defense": sum(p.get_defense_rating() for p in lineup) / len(lineup),
+        "pitching": pitcher.get_pitching_rating(),
+    }
+
+
+def _plate_appearance(rng, batting, pitching, defense, on_base_factor):
+    on_base = _clamp((0.30 + 0.25 * (batting - pitching) - 0.05 * (defense - 0.5)) * on_base_factor, 0.05, 0.75)
+    if rng.random() >= on_base:
+        return None
+
+    # Stronger hitters turn more of their times on base into home runs
+    roll = rng.random()
+    power = _clamp(0.5 + batting, 0.5, 1.5)
+    total = sum(share * (power if outcome == "home_run" else 1) for outcome, share in _ON_BASE_OUTCOMES)
+    for outcome, share in _ON_BASE_OUTCOMES:
+        roll -= share * (power if outcome == "home_run" else 1) / total
+        if roll < 0:
+            return outcome
+    return "home_run"
+
+
+def _half_inning(rng, offense, defense, batter, on_base_factor, runs_to_win=None):
+    # With `runs_to_win` set (the bottom of the 9th or later), the half-inning ends as soon as the home team leads
+    runs = 0
+    outs = 0
+    bases = [False, False, False]
+    lineup = offense["batting"]
+    while outs < 3:
+        outcome = _plate_appearance(rng, lineup[batter], defense["pitching"], defense["defense"], on_base_factor)
+        batter = (batter + 1) % len(lineup)
+        if outcome is None:
+            outs += 1
+        elif outcome == "walk":
+            # Only forced runners move up
+            if bases[0]:
+                if bases[1]:
+                    if bases[2]:
+                        runs += 1
+                    bases[2] = True
+                bases[1] = True
+            bases[0] = True
+        else:
+            advance = _HIT_BASES[outcome]
+            for base in (2, 1, 0):
+                if bases[base]:
+                    bases[base] = False
+                    if base + advance >= 3:
+                        runs += 1
+                    else:
+                        bases[base + advance] = True
+            if advance >= 4:
+                runs += 1
+            else:
+                bases[advance - 1] = True
+        if runs_to_win is not None and runs >= runs_to_win:
+            # Only a walk-off home run counts every runner, otherwise the game ends with the winning run
+            if outcome != "home_run":
+                runs = runs_to_win
+            break
+    return runs, batter
+
+
+def _simulate_game(rng, home, away, on_base_factor, max_innings):
+    home_runs = away_runs = 0
+    home_batter = away_batter = 0
+    inning = 0
+    while inning < 9 or (home_runs == away_runs and inning < max_innings):
+        runs, away_batter = _half_inning(rng, away, home, away_batter, on_base_factor)
+        away_runs += runs
+        # The bottom of the last inning is skipped when the home team is already ahead
+        if inning >= 8 and home_runs > away_runs:
+            break
+        runs_to_win = away_runs - home_runs + 1 if inning >= 8 else None
+        runs, home_batter = _half_inning(rng, home, away, home_batter, on_base_factor, runs_to_win)
+        home_runs += runs
+        inning += 1
+    return home_runs, away_runs
+
+
+def _simulate_chunk(home, away, on_base_factor, max_innings, simulations, seed):
+    rng = random.Random(seed)
+    return [_simulate_game(rng, home, away, on_base_factor, max_innings) for _ in range(simulations)]
+
+
+class GameSimulator:
+    """
+    Monte Carlo game simulator driven by player stlats.
+
+    Each plate appearance is decided by the batter's hitting rating against the pitcher's pitching rating and the
+    fielding team's average defense rating. This is a rough model of Blaseball, meant for comparing teams and
+    checking `Game.home_odds` / `Game.away_odds` at scale, not for reproducing the real simulation.
+
+    Args:
+        home_lineup: list of `Player` batting for the home team, in batting order.
+        away_lineup: list of `Player` batting for the away team, in batting order.
+        home_pitcher: `Player` pitching for the home team.
+        away_pitcher: `Player` pitching for the away team.
+        weather: name of the game's weather.
+        weather_effects: dictionary of weather name to a multiplier for the chance of getting on base.
+        max_innings: innings after which a tied game is stopped and counted as a tie.
+    """
+
+    def __init__(self, home_lineup, away_lineup, home_pitcher, away_pitcher, weather=None, weather_effects=None,
+                 max_innings=30):
+        self.home = _team_ratings(home_lineup, home_pitcher)
+        self.away = _team_ratings(away_lineup, away_pitcher)
+        self.weather = weather
+        self.on_base_factor = (weather_effects or {}).get(weather, 1)
+        self.max_innings = max_innings
+
+    @classmethod
+    def from_game(cls, game, weather_effects=None, max_innings=30):
+        """
+        Create a simulator from the teams, pitchers and weather of a `Game`. If the game has no pitcher set yet,
+        the first pitcher of each team's rotation is used.
+        """
+        home_team, away_team = game.home_team, game.away_team
+        home_pitcher = game.home_pitcher or next(iter(home_team.rotation), None)
+        away_pitcher = game.away_pitcher or next(iter(away_team.rotation), None)
+
+        weather = None
+        if weather_effects:
+            weather = game.weather.name
+        return cls(home_team.lineup, away_team.lineup, home_pitcher, away_pitcher, weather=weather,
+                   weather_effects=weather_effects, max_innings=max_innings)
+
+    def run(self, simulations=10000, seed=None, workers=1, chunk_size=1000):
+        """
+        Simulate the game a number of times and return a `SimulationResult`.
+
+        Args:
+            simulations: number of games to simulate.
+            seed: random seed. The same seed and `chunk_size` always give the same result, whatever `workers` is.
+            workers: number of processes to spread the simulations over. `1` runs in the current process.
+            chunk_size: number of games simulated per task.
+        """
+        seeder = random.Random(seed)
+        chunks = []
+        remaining = simulations
+        while remaining > 0:
+            count = min(chunk_size, remaining)
+            chunks.append((self.home, self.away, self.on_base_factor, self.max_innings, count,
+                           seeder.getrandbits(64)))
+            remaining -= count
+
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(_simulate_chunk, *zip(*chunks)))
+        else:
+            outcomes = [_simulate_chunk(*chunk) for chunk in chunks]
+
+        home_wins = away_wins = ties = 0
+        home_runs = Counter()
+        away_runs = Counter()
+        for chunk in outcomes:
+            for home_score, away_score in chunk:
+                home_runs[home_score] += 1
+                away_runs[away_score] += 1
+                if home_score > away_score:
+                    home_wins += 1
+                elif away_score > home_score:
+                    away_wins += 1
+                else:
+                    ties += 1
+
+        return SimulationResult(
+            simulations=simulations,
+            home_wins=home_wins,
+            away_wins=away_wins,
+            ties=ties,
+            home_win_probability=home_wins / simulations if simulations else 0,
+            away_win_probability=away_wins / simulations if simulations else 0,
+            home_runs=dict(sorted(home_runs.items())),
+            away_runs=dict(sorted(away_runs.items())),
+        )
@@ -1,7 +1,6 @@
-from dateutil.parser import parse
-
 from .base import Base
 from .. import database, chronicler
+from ..utils import parse_timestamp
 
 
 class GlobalEvent(Base):
@@ -25,7 +24,7 @@ class GlobalEvent(Base):
     def load_at_time(cls, time):
         """Returns a list of global events at a timestamp"""
         if isinstance(time, str):
-            time = parse(time)
+            time = parse_timestamp(time)
 
         updates = list(chronicler.get_entities("globalevents", at=time))
         if len(updates) == 0:
@@ -34,4 +33,4 @@ class GlobalEvent(Base):
 
     @Base.lazy_load("_expire")
     def expire(self):
-        return parse(self._expire)
+        return parse_timestamp(self._expire)
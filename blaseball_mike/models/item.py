@@ -1,6 +1,6 @@
 from .base import Base
 from .modification import Modification
-from .. import chronicler, database
+from .. import bundle, chronicler, database
 
 
 class Item(Base):
@@ -27,7 +27,14 @@ class Item(Base):
     @classmethod
     def load_discipline(cls, *ids):
         """Load Pre-S15 Era Items (Bat & Armor slots)"""
-        return [cls(item) for item in chronicler.get_old_items(list(ids))]
+        items = bundle.load("old_items")
+        if items is None:
+            return [cls(item) for item in chronicler.get_old_items(list(ids))]
+
+        items = [item for item in items if item["id"] in ids]
+        if len(items) == 0:
+            return [cls({"id": "????", "name": "????", "attr": "NONE"}) for _ in ids]
+        return [cls(item) for item in items]
 
     @classmethod
     def load_one_discipline(cls, id_):
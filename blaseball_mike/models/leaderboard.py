@@ -1,10 +1,9 @@
 from collections import OrderedDict
 
-from dateutil.parser import parse
-
 from .base import Base
 from .player import Player
 from .. import database, chronicler
+from ..utils import parse_timestamp
 
 
 class Idol(Base):
@@ -52,7 +51,7 @@ class Tribute(Base):
     def load_at_time(cls, time):
         """Load hall of flame at a given time. Returns ordered dictionary of tributes keyed by player ID."""
         if isinstance(time, str):
-            time = parse(time)
+            time = parse_timestamp(time)
 
         tributes = list(chronicler.get_entities("tributes", at=time))
         tributes_dict = OrderedDict()
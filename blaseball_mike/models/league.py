@@ -3,6 +3,7 @@ from collections import OrderedDict
 from .base import Base
 from .team import Team
 from .. import database
+from ..session import ContextThreadPoolExecutor
 
 
 class League(Base):
@@ -29,6 +30,43 @@ class League(Base):
         """Load a League by ID."""
         return cls(database.get_league(id_))
 
+    @classmethod
+    def load_tree(cls, id_=None, workers=4):
+        """
+        Load a League together with all of its subleagues, divisions and teams. Defaults to the current active
+        League.
+
+        Divisions and teams come from one `get_all_divisions` and one `get_all_teams` request, and are wired into
+        `subleagues`, `Subleague.divisions` and `Division.teams` locally. Subleagues, and anything missing from the
+        bulk responses, are requested concurrently.
+        """
+        league = cls.load() if id_ is None else cls.load_by_id(id_)
+        subleague_ids = getattr(league, "_subleague_ids", None) or []
+
+        with ContextThreadPoolExecutor(max_workers=workers) as executor:
+            all_divisions = executor.submit(database.get_all_divisions)
+            all_teams = executor.submit(database.get_all_teams)
+            subleagues = dict(zip(subleague_ids, executor.map(Subleague.load, subleague_ids)))
+
+            division_data = all_divisions.result()
+            division_ids = [id_ for s in subleagues.values() for id_ in getattr(s, "_division_ids", None) or []]
+            missing = [id_ for id_ in division_ids if id_ not in division_data]
+            divisions = {id_: Division(division_data[id_]) for id_ in division_ids if id_ in division_data}
+            divisions.update(zip(missing, executor.map(Division.load, missing)))
+
+            team_data = all_teams.result()
+            team_ids = [id_ for d in divisions.values() for id_ in getattr(d, "_team_ids", None) or []]
+            missing = [id_ for id_ in team_ids if id_ not in team_data]
+            teams = {id_: Team(team_data[id_]) for id_ in team_ids if id_ in team_data}
+            teams.update(zip(missing, executor.map(Team.load, missing)))
+
+        for division in divisions.values():
+            division._teams = {id_: teams[id_] for id_ in getattr(division, "_team_ids", None) or []}
+        for subleague in subleagues.values():
+            subleague._divisions = {id_: divisions[id_] for id_ in getattr(subleague, "_division_ids", None) or []}
+        league._subleagues = subleagues
+        return league
+
     @Base.lazy_load("_subleague_ids", cache_name="_subleagues", default_value=dict())
     def subleagues(self):
         """Returns dictionary keyed by subleague ID."""
@@ -1,5 +1,17 @@
+import threading
+
 from .base import Base
-from .. import database
+from .. import bundle, database
+
+# Raw modification data keyed by ID, once the catalog is enabled
+_CATALOG = {"mods": None}
+_CATALOG_LOCK = threading.Lock()
+
+
+def _index_mods(data):
+    if isinstance(data, dict):
+        data = data.values()
+    return {mod["id"]: mod for mod in data}
 
 
 class Modification(Base):
@@ -11,10 +23,55 @@ class Modification(Base):
 
     @classmethod
     def load(cls, *ids):
-        return [cls(mod) for mod in database.get_attributes(list(ids))]
+        mods = _CATALOG["mods"]
+        if mods is None:
+            return [cls(mod) for mod in database.get_attributes(list(ids))]
+
+        unknown = [id_ for id_ in ids if id_ not in mods]
+        fetched = {}
+        if unknown:
+            results = database.get_attributes(unknown)
+            # The API answers IDs it does not know with a placeholder, so match results to IDs by position
+            if len(results) == len(unknown):
+                fetched = dict(zip(unknown, results))
+            else:
+                fetched = {mod["id"]: mod for mod in results}
+            with _CATALOG_LOCK:
+                mods.update((id_, mod) for id_, mod in fetched.items() if mod.get("id") == id_)
+        return [cls(mods.get(id_) or fetched[id_]) for id_ in ids if id_ in mods or id_ in fetched]
 
     @classmethod
     def load_one(cls, id_):
         if id_ in (None, "NONE", ""):
             return None
         return cls.load(id_)[0]
+
+    @classmethod
+    def enable_catalog(cls):
+        """
+        Serve every `Modification.load` (and so every player, team, item and stadium mod list) from an in-memory
+        catalog of all modifications. The catalog comes from the bundled reference data (see
+        `blaseball_mike.bundle`) if available, otherwise it is downloaded once with `database.get_all_attributes`.
+        IDs missing from the catalog are still requested from the API, and added to it.
+        """
+        if _CATALOG["mods"] is not None:
+            return
+        data = bundle.load("attributes")
+        if data is None:
+            cls.refresh_catalog()
+            return
+        with _CATALOG_LOCK:
+            _CATALOG["mods"] = _index_mods(data)
+
+    @classmethod
+    def refresh_catalog(cls):
+        """Download the modification catalog again, enabling it if needed"""
+        mods = _index_mods(database.get_all_attributes())
+        with _CATALOG_LOCK:
+            _CATALOG["mods"] = mods
+
+    @classmethod
+    def disable_catalog(cls):
+        """Go back to requesting modifications from the API on every load"""
+        with _CATALOG_LOCK:
+            _CATALOG["mods"] = None
@@ -3,12 +3,11 @@ import random
 import uuid
 import warnings
 
-from dateutil.parser import parse
-
 from .base import Base
 from .item import Item
 from .modification import Modification
 from .. import database, chronicler, reference
+from ..utils import parse_timestamp
 
 
 class Player(Base):
@@ -34,7 +33,7 @@ class Player(Base):
             }
         else:
             if isinstance(time, str):
-                time = parse(time)
+                time = parse_timestamp(time)
             players = chronicler.get_entities("player", id_=list(ids), at=time)
             return {
                 player["entityId"]: cls(dict(player["data"], timestamp=time)) for player in players
@@ -1,6 +1,10 @@
 from .base import Base
+from .game import Game
 from .league import League
-from .statsheet import SeasonStatsheet
+from .player import Player
+from .stadium import Stadium
+from .statsheet import GameStatsheet, SeasonStatsheet
+from .team import Team
 from .. import database
 
 
@@ -50,3 +54,90 @@ class Standings(Base):
     def get_standings_by_team(self, id_):
         """Returns a dictionary of wins & losses of a single team"""
         return {"wins": self.wins.get(id_, None), "losses": self.losses.get(id_, None)}
+
+
+class SeasonBundle:
+    """
+    Every game of a season, with their teams, pitchers, stadiums and statsheets loaded in bulk.
+
+    Loading a season with `Game.load_by_season` and then reading `home_team`, `home_pitcher`, etc. makes a request
+    per game and attribute. `SeasonBundle.load` instead makes a handful of bulk requests and fills in those
+    attributes on every game, so they can be read without further requests.
+
+    Attributes:
+        games: dictionary of `Game` keyed by game ID.
+        teams: dictionary of `Team` keyed by team ID.
+        players: dictionary of pitchers (`Player`) keyed by player ID.
+        stadiums: dictionary of `Stadium` keyed by stadium ID.
+        statsheets: dictionary of `GameStatsheet` keyed by statsheet ID.
+    """
+
+    def __init__(self, season, games, teams=None, players=None, stadiums=None, statsheets=None):
+        self.season = season
+        self.games = games
+        self.teams = teams or {}
+        self.players = players or {}
+        self.stadiums = stadiums or {}
+        self.statsheets = statsheets or {}
+
+    @classmethod
+    def load(cls, season, day=None, sim=None, stadiums=True, statsheets=True):
+        """
+        Load a season's games and everything they reference. Season and day are 1-indexed.
+
+        Args:
+            season: season to load.
+            day: only load games from this day.
+            sim: simulation ID, for seasons outside the main simulation.
+            stadiums: set to `False` to skip loading stadiums.
+            statsheets: set to `False` to skip loading game statsheets.
+        """
+        games = Game.load_by_season(season, day=day, sim=sim)
+        bundle = cls(season, games)
+
+        team_ids = set()
+        pitcher_ids = set()
+        stadium_ids = set()
+        statsheet_ids = set()
+        for game in games.values():
+            team_ids.update(getattr(game, attr, None) for attr in ("_home_team_id", "_away_team_id"))
+            pitcher_ids.update(getattr(game, attr, None) for attr in ("_home_pitcher_id", "_away_pitcher_id"))
+            stadium_ids.add(getattr(game, "_stadium_id", None))
+            statsheet_ids.add(getattr(game, "_statsheet_id", None))
+        for ids in (team_ids, pitcher_ids, stadium_ids, statsheet_ids):
+            ids.discard(None)
+            ids.discard("")
+
+        if team_ids:
+            bundle.teams = Team.load_all()
+        if pitcher_ids:
+            bundle.players = Player.load(*pitcher_ids)
+        if stadiums and stadium_ids:
+            bundle.stadiums = Stadium.load_all()
+        if statsheets and statsheet_ids:
+            bundle.statsheets = GameStatsheet.load(list(statsheet_ids))
+
+        bundle._link()
+        return bundle
+
+    def _link(self):
+        links = (
+            ("_home_team_id", "_home_team", self.teams),
+            ("_away_team_id", "_away_team", self.teams),
+            ("_home_pitcher_id", "_home_pitcher", self.players),
+            ("_away_pitcher_id", "_away_pitcher", self.players),
+            ("_stadium_id", "_stadium", self.stadiums),
+            ("_statsheet_id", "_statsheet", self.statsheets),
+        )
+        for game in self.games.values():
+            for id_name, cache_name, loaded in links:
+                value = loaded.get(getattr(game, id_name, None))
+                if value is not None:
+                    setattr(game, cache_name, value)
+
+    def games_by_day(self):
+        """Returns a dictionary of 1-indexed day to a list of that day's games"""
+        days = {}
+        for game in self.games.values():
+            days.setdefault(game.day, []).append(game)
+        return dict(sorted(days.items()))
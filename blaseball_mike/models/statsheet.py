@@ -1,3 +1,4 @@
+from array import array
 from collections import OrderedDict
 
 from .base import Base
@@ -116,3 +117,136 @@ class SeasonStatsheet(Base):
     @Base.lazy_load("_team_stat_ids", cache_name="_team_stats", default_value=list())
     def team_stats(self):
         return list(TeamStatsheet.load(self._team_stat_ids).values())
+
+
+class StatsheetTable:
+    """
+    Player statsheets for a range of games, stored one column per stat, with per-player and per-team rollups.
+
+    Use `load` to fetch every game, team and player statsheet of a span of days with a few bulk requests, instead of
+    walking `Game.statsheet`, `GameStatsheet.home_team_stats` and `TeamStatsheet.player_stats` one object at a time.
+
+    Each row is one player's statsheet for one game. Rows are described by `game_ids`, `days`, `team_ids`,
+    `player_ids` and `names`, and stat values live in `columns`, keyed by the statsheet field name. Columns hold
+    integers until a non-integer value is appended, after which that column holds floats.
+    """
+    STATS = ("atBats", "caughtStealing", "doubles", "earnedRuns", "groundIntoDp", "hits", "hitsAllowed", "homeRuns",
+             "losses", "outsRecorded", "rbis", "runs", "stolenBases", "strikeouts", "struckouts", "triples", "walks",
+             "walksIssued", "wins", "hitByPitch", "hitBatters", "quadruples", "pitchesThrown")
+
+    def __init__(self):
+        self.game_ids = []
+        self.days = []
+        self.team_ids = []
+        self.player_ids = []
+        self.names = []
+        self.columns = {stat: array("l") for stat in self.STATS}
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def append(self, sheet, game_id=None, day=None, team_id=None):
+        """
+        Add a single raw player statsheet. Players without a `playerId` (older statsheets) are identified by name.
+        """
+        self.game_ids.append(game_id)
+        self.days.append(day)
+        self.team_ids.append(team_id or sheet.get("teamId"))
+        self.player_ids.append(sheet.get("playerId") or sheet.get("name"))
+        self.names.append(sheet.get("name"))
+        for stat in self.STATS:
+            value = sheet.get(stat) or 0
+            column = self.columns[stat]
+            if column.typecode == "l" and not isinstance(value, int):
+                column = self.columns[stat] = array("d", column)
+            column.append(value)
+
+    @classmethod
+    def load(cls, season, start_day=1, end_day=None, sim=None):
+        """
+        Load player statsheets for every game of a season between two days (inclusive). Season and day are
+        1-indexed. If `end_day` is `None`, load through the end of the season.
+        """
+        from .game import Game
+        games = [
+            g for g in Game.load_by_season(season, sim=sim).values()
+            if g.day >= start_day and (end_day is None or g.day <= end_day)
+        ]
+
+        game_sheet_ids = [g._statsheet_id for g in games if getattr(g, "_statsheet_id", None)]
+        game_sheets = database.get_game_statsheets(game_sheet_ids) if game_sheet_ids else {}
+
+        # team statsheet ID -> (game, team ID)
+        team_sheet_owners = {}
+        for game in games:
+            sheet = game_sheets.get(getattr(game, "_statsheet_id", None))
+            if sheet is None:
+                continue
+            team_sheet_owners[sheet["homeTeamStats"]] = (game, getattr(game, "_home_team_id", None))
+            team_sheet_owners[sheet["awayTeamStats"]] = (game, getattr(game, "_away_team_id", None))
+        team_sheets = database.get_team_statsheets(list(team_sheet_owners)) if team_sheet_owners else {}
+
+        player_sheet_owners = {}
+        for team_sheet_id, team_sheet in team_sheets.items():
+            for player_sheet_id in team_sheet.get("playerStats", []):
+                player_sheet_owners[player_sheet_id] = team_sheet_owners[team_sheet_id]
+        player_sheets = database.get_player_statsheets(list(player_sheet_owners)) if player_sheet_owners else {}
+
+        table = cls()
+        for player_sheet_id, sheet in player_sheets.items():
+            game, team_id = player_sheet_owners[player_sheet_id]
+            table.append(sheet, game_id=game.id, day=game.day, team_id=team_id)
+        return table
+
+    def totals(self, by="player", stats=None):
+        """
+        Sum stats for each player or team.
+
+        Args:
+            by: `"player"` or `"team"`.
+            stats: list of stat names to sum. Defaults to every stat.
+
+        Returns dictionary keyed by player or team ID of dictionaries of stat totals.
+        """
+        if by == "player":
+            keys = self.player_ids
+        elif by == "team":
+            keys = self.team_ids
+        else:
+            raise ValueError("Totals can only be grouped by player or team")
+
+        result = {key: {} for key in keys}
+        for stat in stats or self.STATS:
+            sums = dict.fromkeys(result, 0)
+            for key, value in zip(keys, self.columns[stat]):
+                sums[key] += value
+            for key, total in sums.items():
+                result[key][stat] = total
+        return result
+
+    def rates(self, by="player"):
+        """
+        Batting and pitching rates for each player or team, computed from `totals`. Rates with no denominator
+        (a player with no at bats has no batting average) are `None`.
+
+        Returns dictionary keyed by player or team ID of dictionaries with `batting_average`, `on_base_percentage`,
+        `slugging`, `earned_run_average`, `whip` and `strikeouts_per_nine`.
+        """
+        def ratio(numerator, denominator):
+            return numerator / denominator if denominator else None
+
+        result = {}
+        for key, t in self.totals(by=by).items():
+            singles = t["hits"] - t["doubles"] - t["triples"] - t["homeRuns"] - t["quadruples"]
+            total_bases = singles + 2 * t["doubles"] + 3 * t["triples"] + 4 * t["homeRuns"] + 5 * t["quadruples"]
+            innings = t["outsRecorded"] / 3
+            result[key] = {
+                "batting_average": ratio(t["hits"], t["atBats"]),
+                "on_base_percentage": ratio(t["hits"] + t["walks"] + t["hitByPitch"],
+                                            t["atBats"] + t["walks"] + t["hitByPitch"]),
+                "slugging": ratio(total_bases, t["atBats"]),
+                "earned_run_average": ratio(9 * t["earnedRuns"], innings),
+                "whip": ratio(t["walksIssued"] + t["hitsAllowed"], innings),
+                "strikeouts_per_nine": ratio(9 * t["strikeouts"], innings),
+            }
+        return result
@@ -1,10 +1,9 @@
-from dateutil.parser import parse
-
 from .base import Base
 from .modification import Modification
 from .player import Player
 from .stadium import Stadium
 from .. import database, chronicler, tables
+from ..utils import parse_timestamp
 
 
 class Team(Base):
@@ -25,7 +24,7 @@ class Team(Base):
             return cls(database.get_team(id_))
         else:
             if isinstance(time, str):
-                time = parse(time)
+                time = parse_timestamp(time)
 
             team = list(chronicler.get_entities("team", id_, at=time))
             if len(team) == 0:
@@ -46,13 +45,59 @@ class Team(Base):
             }
         else:
             if isinstance(time, str):
-                time = parse(time)
+                time = parse_timestamp(time)
 
             teams = chronicler.get_entities("team", at=time)
             return {
                 team["entityId"]: cls(dict(team["data"], timestamp=time)) for team in teams
             }
 
+    @classmethod
+    def load_all_with_rosters(cls, time=None):
+        """
+        Load all teams along with every player on their rosters. See `load_roster`.
+
+        Returns dictionary keyed by team ID.
+        """
+        teams = cls.load_all(time=time)
+        cls.load_rosters(teams.values())
+        return teams
+
+    @classmethod
+    def load_rosters(cls, teams):
+        """
+        Load the lineup, rotation, bullpen, bench and shadows of several teams together. Player IDs from every
+        position of every team are requested in bulk, rather than one request per position per team.
+        """
+        teams = list(teams)
+        ids_by_time = {}
+        for team in teams:
+            ids = ids_by_time.setdefault(getattr(team, "timestamp", None), set())
+            for ids_name, _ in cls._ROSTER_POSITIONS:
+                ids.update(getattr(team, ids_name, None) or [])
+
+        players_by_time = {}
+        for time, ids in ids_by_time.items():
+            ids = list(ids)
+            players = players_by_time[time] = {}
+            if time is None:
+                players.update(Player.load(*ids))
+                continue
+            for i in range(0, len(ids), database.MAX_IDS_PER_REQUEST):
+                players.update(Player.load(*ids[i:i + database.MAX_IDS_PER_REQUEST], time=time))
+
+        for team in teams:
+            players = players_by_time[getattr(team, "timestamp", None)]
+            for ids_name, cache_name in cls._ROSTER_POSITIONS:
+                setattr(team, cache_name, [players.get(id_) for id_ in getattr(team, ids_name, None) or []])
+
+    def load_roster(self):
+        """
+        Load every player on the team's roster with a single request, filling in `lineup`, `rotation`, `bullpen`,
+        `bench` and `shadows`. Historical teams (loaded with `time`) get the players as of that time.
+        """
+        self.load_rosters([self])
+
     @classmethod
     def load_history(cls, id_, order='desc', count=None):
         """
@@ -113,6 +158,14 @@ class Team(Base):
             return name
         return self.location
 
+    _ROSTER_POSITIONS = (
+        ("_lineup_ids", "_lineup"),
+        ("_rotation_ids", "_rotation"),
+        ("_bullpen_ids", "_bullpen"),
+        ("_bench_ids", "_bench"),
+        ("_shadows_ids", "_shadows"),
+    )
+
     @Base.lazy_load("_lineup_ids", cache_name="_lineup", default_value=list())
     def lineup(self):
         time = getattr(self, "timestamp", None)
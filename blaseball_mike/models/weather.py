@@ -1,5 +1,5 @@
 from .base import Base
-from .. import database
+from .. import bundle, database
 
 
 class Weather(Base):
@@ -11,7 +11,13 @@ class Weather(Base):
 
     @classmethod
     def load_one(cls, id_):
-        data = database.get_weather()
-        if id_ < 0 or id_ > len(data):
+        if id_ < 0:
+            data = []
+        else:
+            # Weather added after the bundle was made is only known upstream
+            data = bundle.load("weather")
+            if data is None or id_ >= len(data):
+                data = database.get_weather()
+        if id_ < 0 or id_ >= len(data):
             return cls({"name": "????", "background": "#FFFFFF", "color": "#FFFFFF", "description": "This Weather is unknown"})
         return cls(data[id_])
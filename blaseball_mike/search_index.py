@@ -0,0 +1,227 @@
+"""
+Local full-text index over game updates and feed events.
+
+Build an `EventIndex` from data that has already been downloaded (Chronicler game updates, Eventually or
+Blaseball feed events) and query it offline, without sending every search to a remote service.
+
+>>> from blaseball_mike import chronicler
+>>> from blaseball_mike.search_index import EventIndex
+>>> index = EventIndex()
+>>> index.add_game_updates(chronicler.get_game_updates(season=12, day=1, lazy=True))
+>>> [e.text for e in index.search('"home run" -solo', season=12)]
+"""
+import json
+import re
+from collections import namedtuple
+
+IndexedEvent = namedtuple("IndexedEvent", ["source", "id", "timestamp", "season", "day", "type", "text",
+                                           "player_ids", "team_ids", "game_ids"])
+IndexedEvent.__doc__ = """
+A single searchable event. `source` is `"game_update"` or `"feed"`. Season and day are 1-indexed.
+"""
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_QUERY_RE = re.compile(r'(-?)"([^"]*)"|(\S+)')
+
+
+def _tokenize(text):
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+class EventIndex:
+    """
+    In-memory inverted index over event text, with field indexes for players, teams, games, event type, season
+    and day.
+
+    Text queries (see `search`) support:
+    * `word word` - every word must appear
+    * `"some phrase"` - the words must appear next to each other, in order
+    * `word OR "some phrase"` - either alternative may appear
+    * `-word` / `-"some phrase"` - exclude events containing it
+    """
+
+    def __init__(self):
+        self.events = []
+        # token -> {event position: [token offsets]}
+        self._postings = {}
+        self._by_field = {"player": {}, "team": {}, "game": {}, "type": {}, "season": {}, "day": {}}
+
+    def __len__(self):
+        return len(self.events)
+
+    def add(self, event):
+        """Add a single `IndexedEvent` to the index"""
+        doc = len(self.events)
+        self.events.append(event)
+
+        for offset, token in enumerate(_tokenize(event.text)):
+            self._postings.setdefault(token, {}).setdefault(doc, []).append(offset)
+
+        fields = (
+            ("player", event.player_ids),
+            ("team", event.team_ids),
+            ("game", event.game_ids),
+            ("type", (event.type,)),
+            ("season", (event.season,)),
+            ("day", ((event.season, event.day),)),
+        )
+        for field, values in fields:
+            for value in values:
+                if value is not None and value != "":
+                    self._by_field[field].setdefault(value, set()).add(doc)
+
+    def add_game_updates(self, updates):
+        """
+        Index game updates, as returned by `blaseball_mike.chronicler.get_game_updates`.
+        """
+        for update in updates:
+            data = update["data"]
+            players = [data.get(key) for key in ("homeBatter", "awayBatter", "homePitcher", "awayPitcher")]
+            players.extend(data.get("baseRunners") or [])
+            self.add(IndexedEvent(
+                source="game_update",
+                id=update.get("hash"),
+                timestamp=update.get("timestamp"),
+                season=data["season"] + 1 if data.get("season") is not None else None,
+                day=data["day"] + 1 if data.get("day") is not None else None,
+                type=None,
+                text=data.get("lastUpdate", ""),
+                player_ids=tuple(p for p in players if p),
+                team_ids=tuple(t for t in (data.get("homeTeam"), data.get("awayTeam")) if t),
+                game_ids=(update.get("gameId") or data.get("id") or data.get("_id"),),
+            ))
+
+    def add_feed_events(self, events):
+        """
+        Index feed events, as returned by `blaseball_mike.eventually.search` or the `blaseball_mike.database`
+        feed endpoints.
+        """
+        for event in events:
+            self.add(IndexedEvent(
+                source="feed",
+                id=event.get("id"),
+                timestamp=event.get("created"),
+                season=event["season"] + 1 if event.get("season") is not None else None,
+                day=event["day"] + 1 if event.get("day") is not None else None,
+                type=event.get("type"),
+                text=event.get("description", ""),
+                player_ids=tuple(event.get("playerTags") or ()),
+                team_ids=tuple(event.get("teamTags") or ()),
+                game_ids=tuple(event.get("gameTags") or ()),
+            ))
+
+    def _match_term(self, tokens):
+        if not tokens:
+            return set()
+        postings = [self._postings.get(token) for token in tokens]
+        if any(p is None for p in postings):
+            return set()
+
+        docs = set(postings[0])
+        for p in postings[1:]:
+            docs.intersection_update(p)
+        if len(tokens) == 1:
+            return docs
+
+        # Phrase: every token must follow the previous one directly
+        matches = set()
+        for doc in docs:
+            following = [set(p[doc]) for p in postings[1:]]
+            if any(all(start + i + 1 in offsets for i, offsets in enumerate(following))
+                   for start in postings[0][doc]):
+                matches.add(doc)
+        return matches
+
+    @staticmethod
+    def _parse_query(query):
+        groups = []
+        excluded = []
+        join_next = False
+        for negate, phrase, word in _QUERY_RE.findall(query):
+            if word == "OR":
+                join_next = bool(groups)
+                continue
+            if word.startswith("-") and len(word) > 1:
+                negate, word = "-", word[1:]
+            tokens = _tokenize(phrase if phrase else word)
+            if not tokens:
+                continue
+            if negate:
+                excluded.append(tokens)
+            elif join_next:
+                groups[-1].append(tokens)
+            else:
+                groups.append([tokens])
+            join_next = False
+        return groups, excluded
+
+    def search(self, query=None, player=None, team=None, game=None, type_=None, season=None, day=None, limit=None):
+        """
+        Find events matching a text query and/or field filters. Returns a list of `IndexedEvent` in the order they
+        were added.
+
+        Args:
+            query: text query, see `EventIndex` for the syntax.
+            player: player ID that must be tagged in the event.
+            team: team ID that must be tagged in the event.
+            game: game ID that must be tagged in the event.
+            type_: feed event type ID.
+            season: 1-indexed season.
+            day: 1-indexed day. Requires `season`.
+            limit: maximum number of events to return.
+        """
+        if day is not None and season is None:
+            raise ValueError("Filtering by day requires a season")
+
+        candidates = None
+
+        def narrow(docs):
+            nonlocal candidates
+            candidates = set(docs) if candidates is None else candidates & docs
+
+        filters = (
+            ("player", player),
+            ("team", team),
+            ("game", game),
+            ("type", type_),
+            ("season", season if day is None else None),
+            ("day", (season, day) if day is not None else None),
+        )
+        for field, value in filters:
+            if value is not None:
+                narrow(self._by_field[field].get(value, set()))
+
+        excluded = []
+        if query:
+            groups, excluded = self._parse_query(query)
+            for alternatives in groups:
+                matched = set()
+                for tokens in alternatives:
+                    matched |= self._match_term(tokens)
+                narrow(matched)
+
+        if candidates is None:
+            candidates = set(range(len(self.events)))
+        for tokens in excluded:
+            candidates -= self._match_term(tokens)
+
+        return [self.events[doc] for doc in sorted(candidates)[:limit]]
+
+    def save(self, path):
+        """Write the indexed events to a JSON lines file. The index itself is rebuilt by `load`."""
+        with open(path, "w") as f:
+            for event in self.events:
+                f.write(json.dumps(event._asdict()))
+                f.write("\n")
+
+    @classmethod
+    def load(cls, path):
+        """Rebuild an index from a file written by `save`"""
+        index = cls()
+        with open(path, "r") as f:
+            for line in f:
+                data = json.loads(line)
+                for key in ("player_ids", "team_ids", "game_ids"):
+                    data[key] = tuple(data[key])
+                index.add(IndexedEvent(**data))
+        return index
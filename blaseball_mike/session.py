@@ -1,23 +1,427 @@
+import contextlib
+import contextvars
+import functools
 import os
-import requests_cache
+import sys
+import threading
+import time
+import warnings
+from collections import Counter, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
 from json.decoder import JSONDecodeError
 
+import requests
+import requests_cache
+
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
 _SESSIONS_BY_EXPIRY = {}
+_CACHE_SETTINGS = {"stale_while_revalidate": False, "enabled": True}
+
+RequestRecord = namedtuple("RequestRecord", ["method", "endpoint", "params", "status", "from_cache", "bytes",
+                                             "elapsed", "caller", "error"])
+RequestRecord.__doc__ = """
+A single HTTP request, as passed to request hooks (see `add_request_hook`).
+
+`endpoint` is the URL without its query string and `params` the query parameters. `elapsed` is the time in seconds
+the caller waited for the response, including time spent waiting on an identical request from another thread.
+`caller` is the model attribute (ie `"Team.lineup"`) whose lazy loading sent the request, if any. Requests that
+fail without a response (ie connection errors or timeouts) are recorded too, with `status` set to `None` and the
+exception's `repr` in `error`.
+"""
+
+# Functions called with a `RequestRecord` after every request. Only changed under the lock, and checked without it
+_REQUEST_HOOKS = []
+_REQUEST_HOOKS_LOCK = threading.Lock()
+# Model attribute currently being lazy loaded, set by `Base.lazy_load`
+_REQUEST_CALLER = contextvars.ContextVar("blaseball_mike_request_caller", default=None)
+
+
+class _CoalescingSession(requests_cache.CachedSession):
+    """
+    Cached session that merges concurrent identical GET requests (same URL and query parameters) into a single
+    fetch. The first caller performs the request while every other caller waits for it and receives the same
+    response object.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+
+    def request(self, method, url, *args, params=None, **kwargs):
+        if not _REQUEST_HOOKS:
+            return self._coalesced_request(method, url, *args, params=params, **kwargs)
+
+        start = time.perf_counter()
+        response = error = None
+        try:
+            response = self._coalesced_request(method, url, *args, params=params, **kwargs)
+            return response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            parts = urlsplit(requests.Request(method, url, params=params).prepare().url)
+            record = RequestRecord(
+                method=method.upper(),
+                endpoint=f"{parts.scheme}://{parts.netloc}{parts.path}",
+                params=dict(parse_qsl(parts.query)),
+                status=response.status_code if response is not None else None,
+                from_cache=getattr(response, "from_cache", False),
+                bytes=len(response.content) if response is not None else 0,
+                elapsed=time.perf_counter() - start,
+                caller=_REQUEST_CALLER.get(),
+                error=repr(error) if error is not None else None,
+            )
+            # Every hook sees the request even if an earlier one raises
+            hook_error = None
+            for hook in list(_REQUEST_HOOKS):
+                try:
+                    hook(record)
+                except Exception as e:
+                    hook_error = hook_error or e
+            if hook_error is not None and error is None:
+                raise hook_error
+
+    def _coalesced_request(self, method, url, *args, params=None, **kwargs):
+        # Only plain GETs are safe to share, anything with extra options (headers, etc) is sent as-is
+        if method.upper() != "GET" or args or set(kwargs) - {"allow_redirects"}:
+            return super().request(method, url, *args, params=params, **kwargs)
+
+        key = (requests.Request(method, url, params=params).prepare().url, kwargs.get("allow_redirects"))
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._in_flight[key] = Future()
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            response = super().request(method, url, params=params, **kwargs)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    Thread pool running each task in a copy of the submitting thread's context variables, so requests made by the
+    task keep the caller attribution of request hooks (see `add_request_hook`) and the current tracing span.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def _caching_disabled():
+    return bool(os.getenv("BLASEBALL_MIKE_NOCACHE", None))
+
+
+def _apply_cache_settings(cached_session):
+    cached_session.settings.disabled = not _CACHE_SETTINGS["enabled"]
+    # Serving stale data would defeat the purpose of disabling the cache
+    cached_session.settings.stale_while_revalidate = \
+        False if _caching_disabled() else _CACHE_SETTINGS["stale_while_revalidate"]
 
 
 def session(expiry=0):
-    """Get a caching HTTP session"""
+    """
+    Get a caching HTTP session
+
+    Expired responses are not thrown away if the server sent an `ETag` or `Last-Modified` header with them. Instead
+    the next request is sent as a conditional request (`If-None-Match` / `If-Modified-Since`), and a
+    `304 Not Modified` reply refreshes the cached entry and reuses its body rather than downloading it again.
+
+    Concurrent identical GET requests from several threads share a single fetch and response.
+
+    See `configure_cache` to serve expired responses while they are refreshed in the background.
+    """
 
      # Testing requires caching be disabled or tests may fetch network data from previous tests which would be incorrect.
-    if os.getenv("BLASEBALL_MIKE_NOCACHE", None):
+    if _caching_disabled():
         expiry = 0
 
     if expiry not in _SESSIONS_BY_EXPIRY:
-        _SESSIONS_BY_EXPIRY[expiry] = requests_cache.CachedSession(backend="memory", expire_after=expiry)
+        _SESSIONS_BY_EXPIRY[expiry] = _CoalescingSession(
+            backend="memory",
+            expire_after=expiry,
+            # Expiry follows the caller's `cache_time`, not the server's Cache-Control headers
+            cache_control=False,
+        )
+        _apply_cache_settings(_SESSIONS_BY_EXPIRY[expiry])
     return _SESSIONS_BY_EXPIRY[expiry]
 
 
+def configure_cache(*, stale_while_revalidate=None, enabled=None):
+    """
+    Change the behavior of every caching HTTP session, including ones that have already been created.
+
+    Args:
+        stale_while_revalidate: if `True`, an expired response is returned immediately while a background thread
+            fetches a fresh copy for the next caller. Can also be a number of seconds, after which an expired
+            response is considered too old to serve and the caller waits on the network again. `False` restores
+            the default blocking behavior. Ignored when `BLASEBALL_MIKE_NOCACHE` is set.
+        enabled: if `False`, responses are neither read from nor written to the cache, so every call goes to the
+            network (for example to measure or count requests). `True` turns caching back on.
+    """
+    if stale_while_revalidate is not None:
+        _CACHE_SETTINGS["stale_while_revalidate"] = stale_while_revalidate
+    if enabled is not None:
+        _CACHE_SETTINGS["enabled"] = enabled
+
+    for cached_session in _SESSIONS_BY_EXPIRY.values():
+        _apply_cache_settings(cached_session)
+
+
+class CachePrewarmer(threading.Thread):
+    """
+    Background thread that periodically calls a list of API functions to keep their cache entries populated.
+
+    Each entry in `calls` is a function taking no arguments, such as `blaseball_mike.database.get_simulation_data`
+    or a `functools.partial` of a function with arguments. Errors are ignored so a temporary outage (or any other
+    failing call) does not stop the thread; the error of the most recent failed call is kept in `last_error`.
+    """
+
+    def __init__(self, calls, interval):
+        super().__init__(name="blaseball-mike-prewarm", daemon=True)
+        self.calls = list(calls)
+        self.interval = interval
+        self.last_error = None
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            for call in self.calls:
+                if self._stopped.is_set():
+                    return
+                try:
+                    call()
+                except Exception as error:
+                    self.last_error = error
+            self._stopped.wait(self.interval)
+
+    def stop(self):
+        """Stop refreshing. Any call already in progress is allowed to finish."""
+        self._stopped.set()
+
+
+def prewarm(calls, interval=4):
+    """
+    Start a `CachePrewarmer` that calls each function in `calls` every `interval` seconds.
+
+    Keep `interval` below the `cache_time` of the endpoints being warmed so callers always find a fresh entry.
+    Combined with `configure_cache(stale_while_revalidate=True)` callers never wait on the network for those
+    endpoints after the first round.
+
+    >>> from blaseball_mike import database, session
+    >>> warmer = session.prewarm([database.get_simulation_data, database.get_global_events])
+    >>> warmer.stop()
+    """
+    warmer = CachePrewarmer(calls, interval)
+    warmer.start()
+    return warmer
+
+
+def add_request_hook(hook):
+    """
+    Call `hook` with a `RequestRecord` after every HTTP request made by blaseball_mike, from any thread.
+    Hooks should be quick, since the caller waits for them. If a hook raises, the remaining hooks still run and the
+    first exception is then raised to the caller, unless the request itself failed.
+    """
+    with _REQUEST_HOOKS_LOCK:
+        _REQUEST_HOOKS.append(hook)
+
+
+def remove_request_hook(hook):
+    """Stop calling a hook added with `add_request_hook`"""
+    with _REQUEST_HOOKS_LOCK:
+        if hook in _REQUEST_HOOKS:
+            _REQUEST_HOOKS.remove(hook)
+
+
+def _prometheus_labels(**labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+    return ",".join(f'{key}="{escape(value)}"' for key, value in labels.items() if value is not None)
+
+
+class RequestLog:
+    """
+    Collects every HTTP request made while it is active, see `record_requests`.
+
+    `records` is the list of `RequestRecord` in the order the requests finished.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def counts(self, by=("endpoint", "caller")):
+        """
+        Returns a `collections.Counter` of requests grouped by one or more `RequestRecord` fields.
+
+        >>> log.counts(by="caller").most_common(3)
+        """
+        if isinstance(by, str):
+            return Counter(getattr(record, by) for record in self.records)
+        return Counter(tuple(getattr(record, x) for x in by) for record in self.records)
+
+    def json(self):
+        """Returns the records as a list of dictionaries, ie to write as structured logs"""
+        return [record._asdict() for record in self.records]
+
+    def prometheus(self, prefix="blaseball_mike"):
+        """Returns request counters in the Prometheus text format, labelled by endpoint, caller and cache status"""
+        totals = {}
+        for record in self.records:
+            key = (record.endpoint, record.caller, "hit" if record.from_cache else "miss")
+            count, size, elapsed = totals.get(key, (0, 0, 0.0))
+            totals[key] = (count + 1, size + record.bytes, elapsed + record.elapsed)
+
+        metrics = [
+            ("requests_total", "HTTP requests", 0),
+            ("request_bytes_total", "Bytes received in HTTP responses", 1),
+            ("request_seconds_total", "Time spent waiting on HTTP requests", 2),
+        ]
+        lines = []
+        for name, description, index in metrics:
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for (endpoint, caller, cache), values in sorted(totals.items(), key=lambda x: tuple(map(str, x[0]))):
+                labels = _prometheus_labels(endpoint=endpoint, caller=caller, cache=cache)
+                lines.append(f"{prefix}_{name}{{{labels}}} {values[index]}")
+        return "\n".join(lines) + "\n"
+
+
+@contextlib.contextmanager
+def record_requests():
+    """
+    Context manager recording every HTTP request made inside it, from any thread, into a `RequestLog`.
+
+    >>> from blaseball_mike.models import Team
+    >>> with record_requests() as log:
+    ...     Team.load("8d87c468-699a-47a8-b40d-cfb73a5660ad").lineup
+    >>> log.counts(by="caller")
+    Counter({None: 1, 'Team.lineup': 1})
+    """
+    log = RequestLog()
+    add_request_hook(log)
+    try:
+        yield log
+    finally:
+        remove_request_hook(log)
+
+
+class NPlusOneWarning(UserWarning):
+    """Issued by `detect_n_plus_one` when a lazy loaded attribute sends too many requests"""
+
+
+class NPlusOneError(RuntimeError):
+    """Raised by `detect_n_plus_one` when a lazy loaded attribute sends too many requests"""
+
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_LAZY_LOAD_FILE = os.path.join(_PACKAGE_DIR, "models", "base.py")
+# `detect_n_plus_one` scopes active in the current context, innermost last
+_N_PLUS_ONE_SCOPES = contextvars.ContextVar("blaseball_mike_n_plus_one_scopes", default=())
+
+
+def _call_site():
+    """
+    Returns `(filename, lineno)` of the code outside blaseball_mike that accessed the lazy loaded attribute, or of
+    the code that read the attribute if it was read from inside blaseball_mike
+    """
+    package_prefix = _PACKAGE_DIR + os.sep
+    reader = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename == _LAZY_LOAD_FILE and code.co_name == "__get__":
+            reader = frame.f_back
+        elif reader is not None and not code.co_filename.startswith(package_prefix):
+            return code.co_filename, frame.f_lineno
+        frame = frame.f_back
+    if reader is None:
+        reader = sys._getframe(1)
+    return reader.f_code.co_filename, reader.f_lineno
+
+
+class _NPlusOneDetector:
+    def __init__(self, threshold, action):
+        self.threshold = threshold
+        self.action = action
+        self.counts = Counter()
+        self._reported = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        # Only count requests made inside this scope, not ones from unrelated threads
+        if record.caller is None or self not in _N_PLUS_ONE_SCOPES.get():
+            return
+        with self._lock:
+            self.counts[record.caller] += 1
+            count = self.counts[record.caller]
+            if count <= self.threshold or record.caller in self._reported:
+                return
+            if self.action == "warn":
+                self._reported.add(record.caller)
+
+        filename, lineno = _call_site()
+        message = (f"{record.caller} sent {count} requests (threshold {self.threshold}), most recently from "
+                   f"{filename}:{lineno}. Load the related objects in bulk instead.")
+        if self.action == "raise":
+            raise NPlusOneError(message)
+        warnings.warn_explicit(message, NPlusOneWarning, filename, lineno)
+
+
+@contextlib.contextmanager
+def detect_n_plus_one(threshold=10, action="warn"):
+    """
+    Context manager checking for N+1 request patterns: a lazy loaded attribute (see `Base.lazy_load`) that sends
+    more than `threshold` requests inside the block, usually because it is read once per object in a loop.
+    Requests are counted per attribute (ie `"Feed.team_tags"`) whether or not they were served from the cache, so
+    results do not depend on cache state.
+
+    Only requests made by the code inside the block count, including work it hands to blaseball_mike's worker
+    threads, but not requests made concurrently by other threads. Scopes can be nested.
+
+    Use in tests or CI to catch code that should load related objects in bulk. Yields a `collections.Counter` of
+    requests per attribute.
+
+    Args:
+        threshold: requests allowed per attribute.
+        action: `"warn"` issues a single `NPlusOneWarning` per attribute, pointing at the line that read it.
+            `"raise"` raises `NPlusOneError` from that line instead.
+    """
+    if action not in ("warn", "raise"):
+        raise ValueError(f"Unknown action: {action}")
+
+    detector = _NPlusOneDetector(threshold, action)
+    token = _N_PLUS_ONE_SCOPES.set(_N_PLUS_ONE_SCOPES.get() + (detector,))
+    add_request_hook(detector)
+    try:
+        yield detector.counts
+    finally:
+        remove_request_hook(detector)
+        _N_PLUS_ONE_SCOPES.reset(token)
+
+
 def check_network_response(response):
     """Verify that network response is correct and is valid JSON"""
     response.raise_for_status()
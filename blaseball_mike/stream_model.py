@@ -1,16 +1,8 @@
 """For deserializing stream data."""
-from dateutil.parser import parse
-
-from blaseball_mike.models import (
-    Base,
-    Division,
-    Game,
-    Fight,
-    League,
-    Season,
-    Subleague,
-    Team,
-)
+# Models are looked up on `models` when stream data is deserialized, so importing this module stays cheap
+from blaseball_mike import models
+from blaseball_mike.models.base import Base
+from blaseball_mike.utils import parse_timestamp
 
 
 class StreamData(Base):
@@ -35,17 +27,17 @@ class StreamLeagues(StreamComponent):
 
     def __init__(self, data, parent):
         super().__init__(data, parent)
-        self.teams = {team['id']: Team(team) for team in data.get('teams', {})}
-        self.subleagues = {sl['id']: Subleague(sl) for sl in data.get('subleagues', {})}
-        self.divisions = {d['id']: Division(d) for d in data.get('divisions', {})}
-        self.leagues = {l['id']: League(l) for l in data.get('leagues', {})}
+        self.teams = {team['id']: models.Team(team) for team in data.get('teams', {})}
+        self.subleagues = {sl['id']: models.Subleague(sl) for sl in data.get('subleagues', {})}
+        self.divisions = {d['id']: models.Division(d) for d in data.get('divisions', {})}
+        self.leagues = {l['id']: models.League(l) for l in data.get('leagues', {})}
 
 
 class StreamGames(StreamComponent):
     def __init__(self, data, parent):
         super().__init__(data, parent)
         self.sim = Sim(data.get('sim', {}), parent)
-        self.season = Season(data.get('season', {}))
+        self.season = models.Season(data.get('season', {}))
         self.schedule = Schedule(data.get('schedule', []), parent)
         self.tomorrow_schedule = None  # TODO
         self.postseason = None  # TODO
@@ -70,7 +62,7 @@ class Sim(StreamComponent):
 
     @next_election_end.setter
     def next_election_end(self, value):
-        self._next_election_end = parse(value)
+        self._next_election_end = parse_timestamp(value)
 
     @property
     def next_phase_time(self):
@@ -78,7 +70,7 @@ class Sim(StreamComponent):
 
     @next_phase_time.setter
     def next_phase_time(self, value):
-        self._next_phase_time = parse(value)
+        self._next_phase_time = parse_timestamp(value)
 
     @property
     def next_season_start(self):
@@ -86,14 +78,14 @@ class Sim(StreamComponent):
 
     @next_season_start.setter
     def next_season_start(self, value):
-        self._next_season_start = parse(value)
+        self._next_season_start = parse_timestamp(value)
 
 
 class Schedule(StreamComponent):
 
     def __init__(self, data, parent):
         self._parent = parent
-        self.games = {g['id']: Game(g) for g in data}
+        self.games = {g['id']: models.Game(g) for g in data}
         self.fields = [g['id'] for g in data]
 
 
@@ -101,4 +93,4 @@ class Fights(StreamComponent):
 
     def __init__(self, data, parent):
         self._parent = parent
-        self.boss_fights = {g['id']: Fight(g) for g in data.get('bossFights', [])}
+        self.boss_fights = {g['id']: models.Fight(g) for g in data.get('bossFights', [])}
@@ -0,0 +1,196 @@
+"""
+Optional tracing of model loads, lazy loaded attributes and HTTP requests.
+
+While tracing is on, every `load*` classmethod of a model, every `Base.lazy_load` attribute that is computed (not
+served from its cache) and every HTTP request is recorded as a `Span`. Spans started while another one is open on the
+same thread become its children, so a slow chain such as `game.statsheet.home_team_stats.player_stats` breaks down
+into the loads and requests behind each step. Work blaseball_mike hands to its own worker threads (ie
+`Game.load_by_days`) stays in the trace that started it.
+
+Finished spans are passed to exporters: any function taking a `Span`, such as a `JsonLinesExporter` writing them to a
+file or a `SpanRecorder` keeping them in memory.
+
+>>> from blaseball_mike import tracing
+>>> from blaseball_mike.models import Game
+>>> with tracing.trace("trace.jsonl"):
+...     Game.load_by_id("ebcf203e-6ce7-4d64-8f3e-a78b373c70ff").statsheet.home_team_stats.player_stats
+
+Tracing costs nothing beyond a list check while it is off.
+"""
+import contextlib
+import contextvars
+import functools
+import json
+import random
+import threading
+import time
+
+from . import session
+
+# Functions called with every finished `Span`. Only changed under the lock, and checked without it
+_EXPORTERS = []
+_EXPORTERS_LOCK = threading.Lock()
+_CURRENT_SPAN = contextvars.ContextVar("blaseball_mike_current_span", default=None)
+
+
+class Span:
+    """
+    A timed operation. `kind` is one of `"load"`, `"lazy_load"` or `"http"`; `start` is a Unix timestamp and
+    `duration` is in seconds. Spans in the same tree share a `trace_id`, and `parent_id` is the `span_id` of the
+    enclosing span, or `None` for the root.
+    """
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start", "duration", "attributes", "error")
+
+    def __init__(self, name, kind, parent=None, attributes=None, start=None):
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.kind = kind
+        self.start = time.time() if start is None else start
+        self.duration = None
+        self.attributes = attributes or {}
+        self.error = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.name}>"
+
+    def json(self):
+        """Returns the span as a dictionary"""
+        return {x: getattr(self, x) for x in self.__slots__}
+
+
+def _export(finished):
+    for exporter in list(_EXPORTERS):
+        exporter(finished)
+
+
+@contextlib.contextmanager
+def span(name, kind, **attributes):
+    """
+    Context manager timing the code inside it as a child of the current span. Yields the `Span`, or `None` if
+    tracing is off.
+    """
+    if not _EXPORTERS:
+        yield None
+        return
+
+    current = Span(name, kind, parent=_CURRENT_SPAN.get(), attributes=attributes)
+    token = _CURRENT_SPAN.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as error:
+        current.error = repr(error)
+        raise
+    finally:
+        current.duration = time.perf_counter() - start
+        _CURRENT_SPAN.reset(token)
+        _export(current)
+
+
+def traced(function):
+    """Decorator running a model classmethod (before `classmethod` is applied) inside a `"load"` span"""
+    @functools.wraps(function)
+    def wrapper(cls, *args, **kwargs):
+        if not _EXPORTERS:
+            return function(cls, *args, **kwargs)
+        with span(f"{cls.__name__}.{function.__name__}", "load", model=cls.__name__):
+            return function(cls, *args, **kwargs)
+    return wrapper
+
+
+def _request_span(record):
+    # Requests are reported once they finish, so back-date the span to when the request started
+    finished = Span(f"{record.method} {record.endpoint}", "http", parent=_CURRENT_SPAN.get(),
+                    start=time.time() - record.elapsed, attributes={
+                        "params": record.params,
+                        "status": record.status,
+                        "cache": "hit" if record.from_cache else "miss",
+                        "bytes": record.bytes,
+                        "caller": record.caller,
+                    })
+    finished.duration = record.elapsed
+    finished.error = record.error
+    _export(finished)
+
+
+def add_exporter(exporter):
+    """Turn tracing on (if needed) and call `exporter` with every finished `Span`"""
+    with _EXPORTERS_LOCK:
+        if not _EXPORTERS:
+            session.add_request_hook(_request_span)
+        _EXPORTERS.append(exporter)
+
+
+def remove_exporter(exporter):
+    """Stop calling an exporter added with `add_exporter`, turning tracing off after the last one"""
+    with _EXPORTERS_LOCK:
+        if exporter in _EXPORTERS:
+            _EXPORTERS.remove(exporter)
+            if not _EXPORTERS:
+                session.remove_request_hook(_request_span)
+
+
+class JsonLinesExporter:
+    """
+    Appends each finished span to a file as one line of JSON. Spans are written as they finish, so children come
+    before their parents.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a")
+        self._lock = threading.Lock()
+
+    def __call__(self, finished):
+        line = json.dumps(finished.json(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class SpanRecorder:
+    """Keeps finished spans in memory, in the order they finished"""
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def __call__(self, finished):
+        with self._lock:
+            self.spans.append(finished)
+
+    def children(self, parent):
+        """Returns the spans directly under `parent`, or the root spans if `parent` is `None`"""
+        parent_id = parent.span_id if parent else None
+        return sorted((x for x in self.spans if x.parent_id == parent_id), key=lambda x: x.start)
+
+
+@contextlib.contextmanager
+def trace(exporter=None):
+    """
+    Context manager tracing everything inside it.
+
+    Args:
+        exporter: a file path to write spans to as JSON lines, or an exporter function. Defaults to a new
+            `SpanRecorder`.
+
+    Yields the exporter.
+    """
+    if exporter is None:
+        exporter = SpanRecorder()
+    owned = isinstance(exporter, str)
+    if owned:
+        exporter = JsonLinesExporter(exporter)
+
+    add_exporter(exporter)
+    try:
+        yield exporter
+    finally:
+        remove_exporter(exporter)
+        if owned:
+            exporter.close()
@@ -1,8 +1,30 @@
 """Misc utils"""
 import datetime
+import functools
+
+from dateutil.parser import parse
 
 from . import chronicler
 
+# API timestamps, with (`session.TIMESTAMP_FORMAT`) and without fractional seconds
+_API_TIMESTAMP_FORMATS = ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ")
+
+
+@functools.lru_cache(maxsize=8192)
+def parse_timestamp(value):
+    """
+    Parse a timestamp string into a datetime.
+
+    API timestamps (see `session.TIMESTAMP_FORMAT`) are parsed directly as UTC-aware datetimes, anything else goes
+    through `dateutil`. Results are memoized, since the same timestamps come up again and again.
+    """
+    for timestamp_format in _API_TIMESTAMP_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, timestamp_format).replace(tzinfo=datetime.timezone.utc)
+        except ValueError:
+            pass
+    return parse(value)
+
 
 def print_stlats(*players, headers=None):
     """
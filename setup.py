@@ -11,7 +11,7 @@ install_requires = [
     'python-dateutil',
     'requests',
     'ujson',
-    'requests-cache'
+    'requests-cache>=1.0'
     ]
 
 setuptools.setup(
@@ -24,6 +24,7 @@ setuptools.setup(
     long_description=long_desc,
     long_description_content_type='text/markdown',
     packages=setuptools.find_packages(),
+    package_data={'blaseball_mike': ['data/*.json']},
     install_requires=install_requires,
     python_requires="~=3.8",
 )
@@ -1,3 +1,6 @@
+import http.server
+import threading
+
 import pytest
 from .helpers import CASSETTE_DIR
 
@@ -8,3 +11,28 @@ def vcr_config():
         "cassette_library_dir": CASSETTE_DIR,
         "record_mode": "once"
         }
+
+
+@pytest.fixture(autouse=True)
+def user_data_dir(tmp_path, monkeypatch):
+    """Keep refreshed reference data in the developer's home directory from leaking into tests"""
+    path = tmp_path / "blaseball_mike_data"
+    monkeypatch.setenv("BLASEBALL_MIKE_DATA_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def http_server():
+    """Returns a function serving a request handler class on a local port and returning its URL, until the test ends"""
+    servers = []
+
+    def serve(handler):
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
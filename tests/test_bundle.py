@@ -0,0 +1,115 @@
+"""
+Unit Tests for bundled reference data
+"""
+
+import json
+import pytest
+from blaseball_mike import bundle, chronicler, database
+from blaseball_mike.models import Item, Modification, Weather
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("Bundled data should not touch the network")
+
+    monkeypatch.setattr(database, "get_weather", fail)
+    monkeypatch.setattr(chronicler, "get_old_items", fail)
+
+
+@pytest.fixture
+def tmp_bundle(user_data_dir):
+    bundle._load.cache_clear()
+    yield user_data_dir
+    bundle._load.cache_clear()
+
+
+def test_manifest():
+    info = bundle.manifest()
+    assert info["version"]
+    for name, entry in info["files"].items():
+        assert name in bundle.SOURCES
+        assert bundle.load(name) is not None
+
+
+def test_weather(offline):
+    weather = Weather.load_one(7)
+    assert weather.name == "Solar Eclipse"
+    assert Weather.load_one(-3).name == "????"
+    assert Weather.load_one(len(bundle.load("weather")) - 1).name is not None
+
+
+def test_weather_newer_than_bundle(monkeypatch):
+    weather = bundle.load("weather") + [{"name": "Night"}]
+    monkeypatch.setattr(database, "get_weather", lambda: weather)
+    assert Weather.load_one(len(weather) - 1).name == "Night"
+    assert Weather.load_one(len(weather)).name == "????"
+
+
+def test_old_items(offline):
+    items = Item.load_discipline("FIREPROOF", "GUNBLADE_A")
+    assert [item.name for item in items] == ["Fireproof Jacket", "The Dial Tone"]
+    assert Item.load_one_discipline("FAKE_ITEM").name == "????"
+
+
+def test_unknown():
+    with pytest.raises(ValueError):
+        bundle.load("the_book")
+    with pytest.raises(ValueError):
+        bundle.refresh(["the_book"])
+
+
+def test_refresh(tmp_bundle, monkeypatch):
+    monkeypatch.setitem(bundle.SOURCES, "attributes", lambda: [{"id": "FIREPROOF", "title": "Fireproof"}])
+    assert bundle.load("attributes") is None
+
+    info = bundle.refresh(["attributes"])
+    assert {"weather", "old_items", "attributes"} <= set(info["files"])
+    assert info["version"] == info["files"]["attributes"]["retrieved"]
+    assert bundle.data_dir() == str(tmp_bundle)
+    refreshed = json.loads((tmp_bundle / "manifest.json").read_text())
+    assert list(refreshed["files"]) == ["attributes"]
+    assert bundle.load("attributes") == [{"id": "FIREPROOF", "title": "Fireproof"}]
+    # The copy shipped with the package is untouched
+    assert not (tmp_bundle / "weather.json").exists()
+    assert bundle.load("weather")[7]["name"] == "Solar Eclipse"
+
+    monkeypatch.setattr(database, "get_all_attributes", lambda: pytest.fail("catalog should come from the bundle"))
+    Modification.enable_catalog()
+    try:
+        assert Modification.load_one("FIREPROOF").title == "Fireproof"
+    finally:
+        Modification.disable_catalog()
+
+
+def test_refresh_command(tmp_bundle, monkeypatch, capsys):
+    monkeypatch.setitem(bundle.SOURCES, "weather", lambda: [{"name": "Void"}])
+    bundle.main(["refresh", "weather"])
+    assert json.loads(capsys.readouterr().out)["files"]["weather"]["file"] == "weather.json"
+    assert bundle.load("weather") == [{"name": "Void"}]
+
+
+def test_stale_user_copy(tmp_bundle):
+    """A refreshed copy older than the one shipped with the package is ignored"""
+    tmp_bundle.mkdir()
+    (tmp_bundle / "weather.json").write_text(json.dumps([{"name": "Old"}]))
+    (tmp_bundle / "manifest.json").write_text(json.dumps({"version": "2020-01-01", "files": {
+        "weather": {"file": "weather.json", "source": "blaseball_mike.database.get_weather", "retrieved": "2020-01-01"},
+    }}))
+    assert bundle.load("weather")[7]["name"] == "Solar Eclipse"
+    assert bundle.manifest()["files"]["weather"]["retrieved"] != "2020-01-01"
+
+
+def test_refresh_package(tmp_path, monkeypatch, capsys):
+    package_dir = tmp_path / "package"
+    monkeypatch.setattr(bundle, "PACKAGE_DATA_DIR", str(package_dir))
+    monkeypatch.setitem(bundle.SOURCES, "glossary", lambda: [{"word": "Blaseball"}])
+    bundle._load.cache_clear()
+    try:
+        bundle.main(["refresh", "--package", "glossary"])
+        assert list(json.loads(capsys.readouterr().out)["files"]) == ["glossary"]
+        assert json.loads((package_dir / "manifest.json").read_text())["files"]["glossary"]["file"] == "glossary.json"
+        assert bundle.load("glossary") == [{"word": "Blaseball"}]
+        assert not (tmp_path / "blaseball_mike_data").exists()
+    finally:
+        bundle._load.cache_clear()
@@ -187,3 +187,64 @@ def test_chronicler_v2_versions(type, id, count):
     assert len(data) > 0
     if count is not None:
         assert len(data) == count
+
+
+class TestTimeMap:
+    ENTRIES = [
+        {"season": 0, "tournament": -1, "day": 98, "type": "season",
+         "startTime": "2020-08-01T07:13:21.108Z", "endTime": "2020-08-01T13:00:02.705Z"},
+        {"season": 0, "tournament": -1, "day": 99, "type": "postseason",
+         "startTime": "2020-08-01T13:00:02.705Z", "endTime": "2020-08-01T14:00:02.188Z"},
+        {"season": 0, "tournament": -1, "day": 99, "type": "election",
+         "startTime": "2020-08-01T14:00:02.188Z", "endTime": "2020-08-02T19:00:00.000Z"},
+        {"season": 10, "tournament": 0, "day": 119, "type": "tournament",
+         "startTime": "2020-11-16T17:22:13.099255Z", "endTime": None},
+    ]
+
+    @pytest.fixture
+    def time_map(self):
+        return chron.TimeMap(self.ENTRIES)
+
+    def test_filter(self, time_map):
+        assert [x["day"] for x in time_map.filter(season=1)] == [98, 99, 99]
+        assert [x["type"] for x in time_map.filter(season=1, day=100)] == ["postseason", "election"]
+        assert [x["type"] for x in time_map.filter(season=1, day=100, include_nongame=False)] == ["postseason"]
+        assert [x["day"] for x in time_map.filter(tournament=0)] == [119]
+        assert time_map.filter(season=2) == []
+        with pytest.raises(ValueError):
+            time_map.filter(season=1, tournament=0)
+
+    def test_filter_copies(self, time_map):
+        time_map.filter(season=1)[0]["startTime"] = None
+        assert time_map.filter(season=1)[0]["startTime"] is not None
+
+    def test_gameday_at(self, time_map):
+        from datetime import datetime
+        assert time_map.gameday_at("2020-08-01T13:30:00Z")["day"] == 99
+        assert time_map.gameday_at(datetime(2020, 8, 1, 8))["day"] == 98
+        assert time_map.gameday_at("2020-08-01T00:00:00Z") is None
+        assert time_map.gameday_at("2020-10-01T00:00:00Z") is None
+        assert time_map.gameday_at("2021-01-01T00:00:00Z")["tournament"] == 0
+
+    def test_get_time_map_cached(self, monkeypatch):
+        from blaseball_mike.chronicler import v1
+        requests = []
+
+        class FakeResponse:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {"data": TestTimeMap.ENTRIES}
+
+        class FakeSession:
+            def get(self, url):
+                requests.append(url)
+                return FakeResponse()
+
+        monkeypatch.delenv("BLASEBALL_MIKE_NOCACHE", raising=False)
+        monkeypatch.setattr(v1, "_TIME_MAPS", {})
+        monkeypatch.setattr(v1, "session", lambda cache_time: FakeSession())
+        assert chron.time_map(season=1, day=99)[0]["type"] == "season"
+        assert chron.time_map(season=1, day=100)[0]["type"] == "postseason"
+        assert len(requests) == 1
@@ -0,0 +1,57 @@
+"""
+Unit Tests for the Eventually wrapper
+"""
+
+import threading
+
+import pytest
+from blaseball_mike import eventually
+
+
+class _FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class _FakeSession:
+    def __init__(self, total):
+        self.events = [{"id": str(i)} for i in range(total)]
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None):
+        with self._lock:
+            self.requests.append((params["offset"], params["limit"]))
+        return _FakeResponse(self.events[params["offset"]:params["offset"] + params["limit"]])
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    fake = _FakeSession(537)
+    monkeypatch.setattr(eventually, "session", lambda cache_time: fake)
+    return fake
+
+
+@pytest.mark.parametrize("workers", (1, 4))
+def test_search_everything(fake_session, workers):
+    events = list(eventually.search(limit=-1, batch_size=50, workers=workers))
+    assert [e["id"] for e in events] == [str(i) for i in range(537)]
+
+
+def test_search_parallel_limit(fake_session):
+    events = list(eventually.search(limit=120, batch_size=50, workers=4))
+    assert [e["id"] for e in events] == [str(i) for i in range(120)]
+    assert sorted(fake_session.requests) == [(0, 50), (50, 50), (100, 20)]
+
+
+def test_search_parallel_adaptive(fake_session):
+    events = list(eventually.search(limit=-1, batch_size=10, workers=2, adaptive=True, max_batch_size=80))
+    assert [e["id"] for e in events] == [str(i) for i in range(537)]
+    assert max(count for _, count in fake_session.requests) == 80
+    assert len(fake_session.requests) < 537 // 10
@@ -5,7 +5,7 @@ Unit Tests for Feed Model
 import pytest
 import vcr
 from datetime import datetime
-from blaseball_mike.models import Feed, Player, Team, Game
+from blaseball_mike.models import Feed, FeedEvent, Player, Team, Game
 from .helpers import TestBase, CASSETTE_DIR
 
 
@@ -157,3 +157,209 @@ class TestFeed(TestBase):
     def feed(self, request):
         """Parameterized fixture of various feeds"""
         return request.getfixturevalue(request.param)
+
+
+class TestFeedEvent:
+    @pytest.fixture(scope="class")
+    def raw_event(self):
+        return {
+            "id": "9f2a583f-f3bd-4237-926b-5e80ad3d0ba5",
+            "playerTags": ["b082ca6e-eb11-4eab-8d6a-30f8be522ec4"],
+            "teamTags": ["747b8e4a-7e50-4638-a973-ea7950a3e739"],
+            "gameTags": ["ea7e391a-8c5b-4547-b520-a7ee44a9946c"],
+            "metadata": {"play": 218, "type": 4, "after": 2.7851969158648604, "before": 3.311603618012235},
+            "created": "2021-03-19T06:18:25.709Z",
+            "season": 13,
+            "tournament": -1,
+            "type": 118,
+            "day": 85,
+            "phase": 6,
+            "category": 1,
+            "description": "CONSUMERS ATTACK\nNICHOLAS MORA",
+            "extraField": "kept",
+        }
+
+    def test_fields(self, raw_event):
+        event = FeedEvent(raw_event)
+        assert not hasattr(event, "__dict__")
+        assert event.id == raw_event["id"]
+        assert event.season == 14
+        assert event.day == 86
+        assert event.type == 118
+        assert event.player_tag_ids == ("b082ca6e-eb11-4eab-8d6a-30f8be522ec4",)
+        assert isinstance(event.created, datetime)
+        assert event.metadata["play"] == 218
+
+    def test_json(self, raw_event):
+        event = FeedEvent(raw_event)
+        assert event.json() == raw_event
+        assert list(event.json()) == list(raw_event)
+        assert event.to_feed() == Feed(raw_event)
+
+    def test_lazy_metadata(self, raw_event):
+        import json
+        source = dict(raw_event, metadata=json.dumps(raw_event["metadata"]))
+        event = FeedEvent(source)
+        assert event.metadata == raw_event["metadata"]
+        assert event.metadata is event.metadata
+        assert event.json() == source
+        assert event.to_feed() == Feed(raw_event)
+
+    def test_hash(self, raw_event):
+        events = {FeedEvent(raw_event), FeedEvent(raw_event), FeedEvent(dict(raw_event, id="other"))}
+        assert len(events) == 2
+
+    def test_from_list(self, raw_event):
+        events = FeedEvent.from_list([raw_event, dict(raw_event, id="other")])
+        assert [e.id for e in events] == [raw_event["id"], "other"]
+        assert events[0].team_tag_ids[0] is events[1].team_tag_ids[0]
+        assert events[0]._keys is events[1]._keys
+
+    def test_key_layouts_capped(self, raw_event, monkeypatch):
+        monkeypatch.setattr(FeedEvent, "_KEY_LAYOUTS", {})
+        raw_events = [dict(raw_event, **{f"extra{i}": i}) for i in range(FeedEvent._MAX_KEY_LAYOUTS + 10)]
+        events = FeedEvent.from_list(raw_events)
+        assert len(FeedEvent._KEY_LAYOUTS) == FeedEvent._MAX_KEY_LAYOUTS
+        assert events[-1].json() == raw_events[-1]
+
+
+class _FakeFeedSession:
+    """Serves feed items newest first, with `start` inclusive like the live API"""
+
+    def __init__(self, items):
+        self.items = items
+        self.requests = []
+
+    def get(self, url, params=None):
+        self.requests.append(dict(params))
+        items = self.items
+        if "start" in params:
+            items = [x for x in items if x["created"] <= params["start"]]
+        return _FakeFeedResponse(items[:params["limit"]])
+
+
+class _FakeFeedResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class TestFeedPaging:
+    @pytest.fixture
+    def fake_session(self, monkeypatch):
+        from blaseball_mike import database
+        # Pairs of items share a timestamp, so page boundaries land in the middle of a pair
+        items = [{"id": f"item-{i}", "created": f"2021-03-19T06:{59 - i // 2:02d}:00.000Z", "season": 13}
+                 for i in range(25)]
+        fake = _FakeFeedSession(items)
+        monkeypatch.setattr(database, "session", lambda cache_time: fake)
+        return fake
+
+    def test_lazy_all(self, fake_session):
+        from blaseball_mike import database
+        items = list(database.get_feed_global(limit=None, lazy=True, page_size=5))
+        assert [x["id"] for x in items] == [f"item-{i}" for i in range(25)]
+        assert "start" not in fake_session.requests[0]
+        assert fake_session.requests[1]["start"] == fake_session.items[4]["created"]
+
+    def test_lazy_limit(self, fake_session):
+        from blaseball_mike import database
+        items = list(database.get_feed_team("team", limit=12, lazy=True, page_size=5))
+        assert [x["id"] for x in items] == [f"item-{i}" for i in range(12)]
+
+    def test_lazy_same_timestamp_page(self, fake_session):
+        from blaseball_mike import database
+        # Every page is a single timestamp, so the page has to grow to get past it
+        items = list(database.get_feed_global(limit=None, lazy=True, page_size=2))
+        assert [x["id"] for x in items] == [f"item-{i}" for i in range(25)]
+
+    def test_lazy_timestamp_larger_than_page(self, fake_session):
+        from blaseball_mike import database
+        for item in fake_session.items[3:10]:
+            item["created"] = fake_session.items[3]["created"]
+        items = list(database.get_feed_global(limit=None, lazy=True, page_size=2))
+        assert [x["id"] for x in items] == [f"item-{i}" for i in range(25)]
+        assert max(x["limit"] for x in fake_session.requests) == 16
+
+    def test_lazy_oldest_first(self, fake_session):
+        from blaseball_mike import database
+        # Bad arguments fail at the call, not on first iteration
+        with pytest.raises(ValueError):
+            database.get_feed_global(limit=None, sort=1, lazy=True)
+        with pytest.raises(ValueError):
+            database.get_feed_player("player", sort=1, lazy=True)
+        with pytest.raises(ValueError):
+            database.get_feed_team("team", lazy=True, page_size=0)
+        assert fake_session.requests == []
+
+    def test_load_lazy(self, fake_session):
+        feed = Feed.load_by_player("player", count=7, lazy=True)
+        assert not isinstance(feed, list)
+        feed = list(feed)
+        assert len(feed) == 7
+        assert all(isinstance(x, Feed) for x in feed)
+        assert feed[0].season == 14
+
+
+class TestFeedResolveTags:
+    def test_resolve_tags(self, monkeypatch):
+        from blaseball_mike import database
+        calls = []
+
+        def get_player(ids):
+            calls.append(("player", sorted(ids)))
+            return {id_: {"id": id_, "name": id_} for id_ in ids if id_ != "p-gone"}
+
+        def get_all_teams():
+            calls.append(("teams",))
+            return {"team-a": {"id": "team-a"}, "team-b": {"id": "team-b"}}
+
+        def get_team(id_):
+            calls.append(("team", id_))
+            return {"id": id_}
+
+        def get_games(season, day):
+            calls.append(("games", season, day))
+            return {"game-1": {"id": "game-1"}, "game-2": {"id": "game-2"}}
+
+        def get_game_by_id(id_):
+            calls.append(("game", id_))
+            return {"id": id_}
+
+        monkeypatch.setattr(database, "get_player", get_player)
+        monkeypatch.setattr(database, "get_all_teams", get_all_teams)
+        monkeypatch.setattr(database, "get_team", get_team)
+        monkeypatch.setattr(database, "get_games", get_games)
+        monkeypatch.setattr(database, "get_game_by_id", get_game_by_id)
+
+        base = {"season": 13, "day": 4, "tournament": -1, "created": "2021-03-19T06:18:25.709Z"}
+        items = [
+            Feed(dict(base, playerTags=["p1", "p2"], teamTags=["team-a"], gameTags=["game-1"])),
+            Feed(dict(base, playerTags=["p2", "p-gone"], teamTags=["team-b", "team-c"], gameTags=["game-2"])),
+            Feed(dict(base, playerTags=[], teamTags=[], gameTags=["game-3"], tournament=0)),
+        ] * 100
+
+        Feed.resolve_tags(items)
+        assert sorted(calls, key=str) == sorted([
+            ("player", ["p-gone", "p1", "p2"]),
+            ("player", ["p-gone"]),
+            ("teams",),
+            ("team", "team-c"),
+            ("games", 14, 5),
+            ("game", "game-3"),
+        ], key=str)
+
+        calls.clear()
+        assert [p.id for p in items[0].player_tags] == ["p1", "p2"]
+        assert items[1].player_tags[0].id == "p2"
+        assert items[1].player_tags[1] is None
+        assert [t.id for t in items[1].team_tags] == ["team-b", "team-c"]
+        assert [g.id for g in items[1].game_tags] == ["game-2"]
+        assert [g.id for g in items[2].game_tags] == ["game-3"]
+        assert items[2].player_tags == []
+        assert calls == []
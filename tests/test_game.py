@@ -250,6 +250,71 @@ class TestGame(TestBase):
         if away_payout:
             assert game.away_payout(bet) == away_payout
 
+    @pytest.mark.parametrize('season', [6, 12, 14])
+    def test_payout_table(self, season):
+        """Verify bulk payouts match the single game calculation"""
+        games = [
+            Game({"id": f"game-{i}", "homeOdds": odds, "awayOdds": 1 - odds, "season": season - 1})
+            for i, odds in enumerate([0.35, 0.5, 0.5403796505307827, 0.62])
+        ]
+        bets = [1, 9, 696, 1000, 1080]
+        table = Game.payout_table(games, bets)
+        assert list(table) == [game.id for game in games]
+        for game in games:
+            row = table[game.id]
+            assert row["home_payouts"] == [game.home_payout(bet) for bet in bets]
+            assert row["away_payouts"] == [game.away_payout(bet) for bet in bets]
+            assert row["home_expected"][-1] == pytest.approx(game.home_odds * game.home_payout(1080) - 1080)
+
+        overridden = Game.payout_table({game.id: game for game in games}, [1000], season=12)
+        assert overridden["game-0"]["away_payouts"] == [games[0].away_payout(1000, season=12)]
+
+    def test_payout_table_seasons(self):
+        """One table per season, each using that season's formula"""
+        games = [
+            Game({"id": f"game-{i}", "homeOdds": odds, "awayOdds": 1 - odds, "season": 13})
+            for i, odds in enumerate([0.35, 0.5, 0.62])
+        ]
+        bets = [9, 1000]
+        eras = Game.payout_table(games, bets, seasons=[6, 11, 12, 14])
+        assert list(eras) == [6, 11, 12, 14]
+        for season, table in eras.items():
+            assert table == Game.payout_table(games, bets, season=season)
+            for game in games:
+                assert table[game.id]["away_payouts"] == [game.away_payout(bet, season=season) for bet in bets]
+        assert eras[6] == eras[11]
+        assert eras[12]["game-2"]["home_payouts"] != eras[14]["game-2"]["home_payouts"]
+        with pytest.raises(ValueError):
+            Game.payout_table(games, bets, season=12, seasons=[12])
+
+    def test_load_by_days(self, monkeypatch):
+        import threading
+        import time
+        from blaseball_mike import database
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def get_games(season, day):
+            with lock:
+                active.append(day)
+                peak.append(len(active))
+            time.sleep(0.05 if day == 1 else 0.01)
+            with lock:
+                active.remove(day)
+            return {f"game-{day}-{sim}": {"id": f"game-{day}-{sim}", "day": day - 1, "sim": sim}
+                    for sim in ("gamma10", "thisidisstaticyo")}
+
+        monkeypatch.setattr(database, "get_games", get_games)
+        results = list(Game.load_by_days(12, range(1, 7), sim="gamma10", workers=3))
+        assert sorted(day for day, _ in results) == [1, 2, 3, 4, 5, 6]
+        # The slow first day does not hold back the others
+        assert results[0][0] != 1
+        assert max(peak) == 3
+        for day, games in results:
+            assert list(games) == [f"game-{day}-gamma10"]
+            assert isinstance(games[f"game-{day}-gamma10"], Game)
+
     @pytest.mark.vcr
     def test_load_by_id(self):
         game = Game.load_by_id("2eb1b614-2a5c-440b-bbac-74e3ae054fc6")
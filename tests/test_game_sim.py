@@ -0,0 +1,63 @@
+import random
+
+import pytest
+from blaseball_mike.models import GameSimulator, Player
+from blaseball_mike.models.game_sim import _half_inning, _team_ratings
+
+_STLATS = ["tragicness", "patheticism", "thwackability", "divinity", "moxie", "musclitude", "martyrdom",
+           "unthwackability", "ruthlessness", "overpowerment", "shakespearianism", "coldness", "omniscience",
+           "tenaciousness", "watchfulness", "anticapitalism", "chasiness"]
+
+
+def _player(value, id_="player"):
+    stlats = {stlat: value for stlat in _STLATS}
+    # Negative stlats: lower is better
+    stlats["tragicness"] = stlats["patheticism"] = 1 - value
+    return Player(dict(stlats, id=id_, name=id_))
+
+
+class TestGameSimulator:
+    @pytest.fixture
+    def strong_home(self):
+        return GameSimulator([_player(0.9)] * 9, [_player(0.2)] * 9, _player(0.9), _player(0.2))
+
+    def test_favorite_wins(self, strong_home):
+        result = strong_home.run(2000, seed=1)
+        assert result.simulations == 2000
+        assert result.home_wins + result.away_wins + result.ties == 2000
+        assert result.home_win_probability > 0.7
+        assert sum(result.home_runs.values()) == 2000
+
+    def test_even_teams(self):
+        sim = GameSimulator([_player(0.5)] * 9, [_player(0.5)] * 9, _player(0.5), _player(0.5))
+        result = sim.run(4000, seed=2)
+        assert 0.4 < result.home_win_probability < 0.6
+
+    def test_seeded(self, strong_home):
+        assert strong_home.run(500, seed=3, chunk_size=100) == strong_home.run(500, seed=3, chunk_size=100)
+
+    def test_processes(self, strong_home):
+        assert strong_home.run(300, seed=4, workers=2, chunk_size=100) == \
+            strong_home.run(300, seed=4, workers=1, chunk_size=100)
+
+    def test_weather_effects(self):
+        args = ([_player(0.5)] * 9, [_player(0.5)] * 9, _player(0.5), _player(0.5))
+        plain = GameSimulator(*args).run(1000, seed=5)
+        boosted = GameSimulator(*args, weather="Sun 2", weather_effects={"Sun 2": 1.5}).run(1000, seed=5)
+        assert sum(k * v for k, v in boosted.home_runs.items()) > sum(k * v for k, v in plain.home_runs.items())
+
+    def test_walk_off(self):
+        """The bottom of the 9th and extra innings end as soon as the home team takes the lead"""
+        home = _team_ratings([_player(0.9)] * 9, _player(0.9))
+        away = _team_ratings([_player(0.1)] * 9, _player(0.1))
+        rng = random.Random(6)
+        full = [_half_inning(rng, home, away, 0, 1)[0] for _ in range(200)]
+        walk_off = [_half_inning(rng, home, away, 0, 1, runs_to_win=1)[0] for _ in range(200)]
+        assert max(full) > 4
+        # A walk-off grand slam is the most a one run deficit can turn into
+        assert max(walk_off) <= 4
+        assert sum(walk_off) < sum(full)
+
+    def test_missing_pitcher(self):
+        with pytest.raises(ValueError):
+            GameSimulator([_player(0.5)], [_player(0.5)], None, _player(0.5))
@@ -0,0 +1,39 @@
+"""
+Unit Tests for lazy package imports
+"""
+
+import subprocess
+import sys
+import pytest
+
+
+def test_lazy_import():
+    """Importing the packages should not pull in the models or the HTTP stack"""
+    code = ("import sys, blaseball_mike, blaseball_mike.models, blaseball_mike.chronicler; "
+            "print(sorted(x for x in sys.modules if x.startswith(('requests', 'blaseball_mike.models.'))))")
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    assert out.strip() == "[]"
+
+
+def test_lazy_stream_model():
+    """Stream data only imports the models it deserializes once it is used"""
+    code = ("import sys, blaseball_mike.stream_model; "
+            "print(sorted(x for x in sys.modules if x.startswith('blaseball_mike.models.')))")
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    assert out.strip() == "['blaseball_mike.models.base']"
+
+
+@pytest.mark.parametrize("package", ["blaseball_mike", "blaseball_mike.models", "blaseball_mike.chronicler"])
+def test_all_names(package):
+    module = __import__(package, fromlist=["__all__"])
+    for name in module.__all__:
+        assert getattr(module, name) is not None
+        assert name in dir(module)
+
+
+def test_missing_attribute():
+    import blaseball_mike.models
+    with pytest.raises(AttributeError):
+        blaseball_mike.models.NotAModel
+    with pytest.raises(ImportError):
+        from blaseball_mike.chronicler import not_an_endpoint  # noqa: F401
@@ -0,0 +1,100 @@
+"""
+Unit Tests for incremental game update ingestion
+"""
+
+import pytest
+from blaseball_mike import chronicler
+from blaseball_mike.ingest import GameUpdateIngestor
+from blaseball_mike.utils import parse_timestamp
+
+
+def _update(game_id, timestamp, hash_, season=11):
+    return {"gameId": game_id, "timestamp": timestamp, "hash": hash_, "data": {"season": season, "lastUpdate": hash_}}
+
+
+@pytest.fixture
+def fake_updates(monkeypatch):
+    """Stand-in for Chronicler, where `after` is exclusive"""
+    updates = []
+    calls = []
+
+    def get_game_updates(after=None, **kwargs):
+        calls.append(dict(kwargs, after=after))
+        return iter([u for u in updates if after is None or parse_timestamp(u["timestamp"]) > parse_timestamp(after)])
+
+    monkeypatch.setattr(chronicler, "get_game_updates", get_game_updates)
+    return updates, calls
+
+
+def test_ingest_only_new_updates(fake_updates):
+    updates, calls = fake_updates
+    updates.extend([
+        _update("game-a", "2021-03-01T00:00:01.000Z", "a1"),
+        _update("game-b", "2021-03-01T00:00:02.000Z", "b1"),
+    ])
+    ingestor = GameUpdateIngestor(season=12)
+    assert [u["hash"] for u in ingestor.poll()] == ["a1", "b1"]
+    assert calls[0]["after"] is None
+    assert calls[0]["season"] == 12
+
+    updates.extend([
+        _update("game-a", "2021-03-01T00:00:02.000Z", "a2"),
+        _update("game-b", "2021-03-01T00:00:03.000Z", "b2"),
+    ])
+    assert [u["hash"] for u in ingestor.poll()] == ["a2", "b2"]
+    assert calls[1]["after"] == "2021-03-01T00:00:01.999000Z"
+    assert list(ingestor.poll()) == []
+
+    assert ingestor.watermark(12, "game-a") == "2021-03-01T00:00:02.000Z"
+    assert ingestor.watermark(12, "game-b") == "2021-03-01T00:00:03.000Z"
+    assert ingestor.watermark(12, "game-c") is None
+
+
+def test_ingest_persists_watermarks(fake_updates, tmp_path):
+    updates, calls = fake_updates
+    state_path = str(tmp_path / "watermarks.json")
+    updates.append(_update("game-a", "2021-03-01T00:00:01.000Z", "a1"))
+    assert len(list(GameUpdateIngestor(state_path=state_path).poll())) == 1
+
+    updates.append(_update("game-a", "2021-03-01T00:00:01.000Z", "a2"))
+    restarted = GameUpdateIngestor(state_path=state_path)
+    assert restarted.cursor == "2021-03-01T00:00:01.000Z"
+    assert [u["hash"] for u in restarted.poll()] == ["a2"]
+
+
+def test_ingest_late_update_at_cursor(fake_updates):
+    """An update sharing the cursor's timestamp that shows up after a poll is still emitted, once"""
+    updates, calls = fake_updates
+    updates.append(_update("game-a", "2021-03-01T00:00:00.000Z", "a1"))
+    ingestor = GameUpdateIngestor()
+    assert [u["hash"] for u in ingestor.poll()] == ["a1"]
+
+    updates.append(_update("game-b", "2021-03-01T00:00:00.000Z", "b1"))
+    assert [u["hash"] for u in ingestor.poll()] == ["b1"]
+    assert calls[1]["after"] == "2021-02-28T23:59:59.999000Z"
+    assert list(ingestor.poll()) == []
+
+
+def test_ingest_timestamp_precision(fake_updates):
+    """Timestamps with no or fewer fraction digits are compared by time, not as strings"""
+    updates, calls = fake_updates
+    updates.extend([
+        _update("game-a", "2020-08-01T15:00:10Z", "a1"),
+        _update("game-b", "2020-08-01T15:00:01.84Z", "b1"),
+    ])
+    ingestor = GameUpdateIngestor()
+    assert [u["hash"] for u in ingestor.poll()] == ["a1", "b1"]
+    assert ingestor.cursor == "2020-08-01T15:00:10Z"
+
+    updates.extend([
+        _update("game-a", "2020-08-01T15:00:10.5Z", "a2"),
+        _update("game-b", "2020-08-01T15:00:01.840Z", "b1"),
+    ])
+    assert [u["hash"] for u in ingestor.poll()] == ["a2"]
+    assert calls[1]["after"] == "2020-08-01T15:00:09.999000Z"
+    assert ingestor.watermarks["12/game-a"] == {"timestamp": "2020-08-01T15:00:10.5Z", "hashes": ["a2"]}
+
+
+def test_ingest_bad_args():
+    with pytest.raises(ValueError):
+        GameUpdateIngestor(season=12, tournament=1)
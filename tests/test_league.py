@@ -197,3 +197,47 @@ class TestTiebreaker(TestBase):
     def tiebreaker(self, request):
         """Parameterized fixture of various tiebreakers"""
         return request.getfixturevalue(request.param)
+
+
+class TestLeagueTree:
+    def test_load_tree(self, monkeypatch):
+        from blaseball_mike import database
+        calls = []
+
+        def record(name, result):
+            def fetch(*args):
+                calls.append((name, *args))
+                return result(*args) if callable(result) else result
+            return fetch
+
+        monkeypatch.setattr(database, "get_league", record("league", {"id": "league", "subleagues": ["sub-a", "sub-b"]}))
+        monkeypatch.setattr(database, "get_subleague", record("subleague", lambda id_: {
+            "id": id_, "divisions": [f"{id_}-div-1", f"{id_}-div-2"]}))
+        monkeypatch.setattr(database, "get_all_divisions", record("divisions", {
+            f"sub-{s}-div-{d}": {"id": f"sub-{s}-div-{d}", "teams": [f"{s}{d}-team-1", f"{s}{d}-team-2"]}
+            for s in "ab" for d in (1, 2) if (s, d) != ("b", 2)}))
+        monkeypatch.setattr(database, "get_division", record("division", lambda id_: {"id": id_, "teams": ["b2-team-1"]}))
+        monkeypatch.setattr(database, "get_all_teams", record("teams", {
+            f"{s}{d}-team-{t}": {"id": f"{s}{d}-team-{t}"} for s in "ab" for d in (1, 2) for t in (1, 2)
+            if f"{s}{d}-team-{t}" != "a1-team-2"}))
+        monkeypatch.setattr(database, "get_team", record("team", lambda id_: {"id": id_}))
+
+        league = League.load_tree("league")
+        assert sorted(calls) == sorted([
+            ("league", "league"),
+            ("subleague", "sub-a"),
+            ("subleague", "sub-b"),
+            ("divisions",),
+            ("division", "sub-b-div-2"),
+            ("teams",),
+            ("team", "a1-team-2"),
+        ])
+
+        calls.clear()
+        assert list(league.subleagues) == ["sub-a", "sub-b"]
+        assert list(league.subleagues["sub-b"].divisions) == ["sub-b-div-1", "sub-b-div-2"]
+        assert isinstance(league.subleagues["sub-a"].divisions["sub-a-div-1"], Division)
+        assert list(league.subleagues["sub-a"].divisions["sub-a-div-1"].teams) == ["a1-team-1", "a1-team-2"]
+        assert len(league.teams) == 7
+        assert all(isinstance(team, Team) for team in league.teams.values())
+        assert calls == []
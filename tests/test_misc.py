@@ -5,7 +5,7 @@ Unit Tests for Misc Models
 import pytest
 import vcr
 from blaseball_mike.models import SimulationData, League, Season, GlobalEvent, \
-    SeasonStatsheet, Standings, Item, Modification, Weather
+    SeasonStatsheet, Standings, Item, Modification, Weather, SeasonBundle, Game
 from blaseball_mike.tables import Tarot
 from .helpers import TestBase, base_test, CASSETTE_DIR
 from datetime import datetime
@@ -187,6 +187,84 @@ class TestSeason(TestBase):
         return request.getfixturevalue(request.param)
 
 
+class TestSeasonBundle:
+    def test_load(self, monkeypatch):
+        from blaseball_mike import chronicler, database
+        calls = []
+
+        def get_games(**kwargs):
+            calls.append("games")
+            return [
+                {"gameId": f"game-{i}", "data": {
+                    "id": f"game-{i}", "season": 11, "day": i % 3, "homeTeam": "team-a", "awayTeam": "team-b",
+                    "homePitcher": f"pitcher-{i % 5}", "awayPitcher": f"pitcher-{i % 7}",
+                    "stadiumId": "stadium-a", "statsheet": f"sheet-{i}",
+                }} for i in range(30)
+            ]
+
+        def get_all_teams():
+            calls.append("teams")
+            return {"team-a": {"id": "team-a"}, "team-b": {"id": "team-b"}}
+
+        def get_player(ids):
+            calls.append("players")
+            return {id_: {"id": id_} for id_ in ids}
+
+        def get_entities(type_, **kwargs):
+            calls.append(type_)
+            return [{"entityId": "stadium-a", "data": {"id": "stadium-a"}}]
+
+        def get_game_statsheets(ids):
+            calls.append("statsheets")
+            return {id_: {"id": id_} for id_ in ids}
+
+        monkeypatch.setattr(chronicler, "get_games", get_games)
+        monkeypatch.setattr(chronicler, "get_entities", get_entities)
+        monkeypatch.setattr(database, "get_all_teams", get_all_teams)
+        monkeypatch.setattr(database, "get_player", get_player)
+        monkeypatch.setattr(database, "get_game_statsheets", get_game_statsheets)
+
+        bundle = SeasonBundle.load(12)
+        assert sorted(calls) == ["games", "players", "stadium", "statsheets", "teams"]
+        assert len(bundle.games) == 30
+        assert len(bundle.players) == 7
+        assert list(bundle.games_by_day()) == [1, 2, 3]
+
+        calls.clear()
+        game = bundle.games["game-4"]
+        assert isinstance(game, Game)
+        assert game.home_team.id == "team-a"
+        assert game.away_pitcher.id == "pitcher-4"
+        assert game.stadium.id == "stadium-a"
+        assert game.statsheet.id == "sheet-4"
+        assert calls == []
+
+    def test_chunked_ids(self, monkeypatch):
+        from blaseball_mike import database
+        urls = []
+
+        class FakeResponse:
+            def __init__(self, url):
+                self.ids = url.split("ids=")[1].split(",")
+
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return [{"id": id_} for id_ in self.ids]
+
+        class FakeSession:
+            def get(self, url):
+                urls.append(url)
+                return FakeResponse(url)
+
+        monkeypatch.setattr(database, "session", lambda cache_time: FakeSession())
+        ids = [f"player-{i}" for i in range(database.MAX_IDS_PER_REQUEST * 2 + 1)]
+        assert list(database.get_player(ids)) == ids
+        assert len(urls) == 3
+        assert list(database.get_game_statsheets(",".join(ids[:3]))) == ids[:3]
+
+
 class TestStandings(TestBase):
     def test_base_compliance(self, standing):
         self.base_test(standing)
@@ -242,6 +320,47 @@ def test_modification_bad_id():
     assert modification.description == "This Modification is unknown."
 
 
+class TestModificationCatalog:
+    @pytest.fixture
+    def requests(self, monkeypatch):
+        from blaseball_mike import database
+        requests = []
+
+        def get_all_attributes():
+            requests.append("all")
+            return [{"id": "FIREPROOF", "title": "Fireproof"}, {"id": "PARTY_TIME", "title": "Party Time"}]
+
+        def get_attributes(ids):
+            requests.append(ids)
+            return [{"id": id_, "title": id_.title()} if id_ == "NEW_MOD" else {"id": "????", "title": "????"}
+                    for id_ in ids]
+
+        monkeypatch.setattr(database, "get_all_attributes", get_all_attributes)
+        monkeypatch.setattr(database, "get_attributes", get_attributes)
+        Modification.enable_catalog()
+        yield requests
+        Modification.disable_catalog()
+
+    def test_catalog(self, requests):
+        mods = Modification.load("PARTY_TIME", "FIREPROOF")
+        assert [mod.title for mod in mods] == ["Party Time", "Fireproof"]
+        assert mods[0] is not Modification.load_one("PARTY_TIME")
+        assert requests == ["all"]
+
+    def test_unknown(self, requests):
+        assert Modification.load_one("NEW_MOD").title == "New_Mod"
+        assert Modification.load_one("NEW_MOD").id == "NEW_MOD"
+        assert Modification.load_one("FAKE_MODIFICATION").id == "????"
+        assert Modification.load_one("FAKE_MODIFICATION").id == "????"
+        assert requests == ["all", ["NEW_MOD"], ["FAKE_MODIFICATION"], ["FAKE_MODIFICATION"]]
+
+    def test_refresh(self, requests):
+        Modification.enable_catalog()
+        assert requests == ["all"]
+        Modification.refresh_catalog()
+        assert requests == ["all", "all"]
+
+
 @pytest.mark.vcr
 def test_weather_by_id():
     weather = Weather.load_one(7)
@@ -0,0 +1,80 @@
+"""
+Unit Tests for the local event search index
+"""
+
+import pytest
+from blaseball_mike.search_index import EventIndex
+
+
+def _update(hash_, text, day=0, batter="", runners=()):
+    return {
+        "gameId": "game-1",
+        "timestamp": "2021-03-01T00:00:00.000Z",
+        "hash": hash_,
+        "data": {"season": 11, "day": day, "lastUpdate": text, "homeTeam": "team-home", "awayTeam": "team-away",
+                 "homeBatter": batter, "awayBatter": "", "homePitcher": "pitcher-1", "awayPitcher": "pitcher-2",
+                 "baseRunners": list(runners)},
+    }
+
+
+@pytest.fixture
+def index():
+    idx = EventIndex()
+    idx.add_game_updates([
+        _update("u1", "Jessica Telephone hits a solo home run!", batter="player-jt"),
+        _update("u2", "York Silk hits a 2-run home run!", batter="player-ys", runners=["player-jt"]),
+        _update("u3", "Run home, sweet home.", day=1),
+    ])
+    idx.add_feed_events([{
+        "id": "feed-1", "description": "Jessica Telephone was incinerated.", "playerTags": ["player-jt"],
+        "teamTags": ["team-home"], "gameTags": [], "type": 54, "season": 11, "day": 1,
+        "created": "2021-03-01T00:00:01.000Z",
+    }])
+    return idx
+
+
+def _ids(events):
+    return [e.id for e in events]
+
+
+def test_search_words(index):
+    assert len(index) == 4
+    assert _ids(index.search("jessica")) == ["u1", "feed-1"]
+    assert _ids(index.search("home run")) == ["u1", "u2", "u3"]
+
+
+def test_search_phrase(index):
+    assert _ids(index.search('"home run"')) == ["u1", "u2"]
+    assert _ids(index.search('"run home"')) == ["u2", "u3"]
+    assert _ids(index.search('"solo run"')) == []
+
+
+def test_search_boolean(index):
+    assert _ids(index.search('"home run" -solo')) == ["u2"]
+    assert _ids(index.search('incinerated OR solo')) == ["u1", "feed-1"]
+    assert _ids(index.search('-"home run"')) == ["u3", "feed-1"]
+
+
+def test_search_fields(index):
+    assert _ids(index.search(player="player-jt")) == ["u1", "u2", "feed-1"]
+    assert _ids(index.search("telephone", player="player-jt", type_=54)) == ["feed-1"]
+    assert _ids(index.search(season=12, day=2)) == ["u3", "feed-1"]
+    assert _ids(index.search(team="team-away", game="game-1", limit=1)) == ["u1"]
+    with pytest.raises(ValueError):
+        index.search(day=1)
+
+
+def test_null_base_runners():
+    update = _update("u4", "Nobody on base.", batter="player-ys")
+    update["data"]["baseRunners"] = None
+    idx = EventIndex()
+    idx.add_game_updates([update])
+    assert _ids(idx.search(player="player-ys")) == ["u4"]
+
+
+def test_save_load(index, tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    index.save(path)
+    loaded = EventIndex.load(path)
+    assert loaded.events == index.events
+    assert _ids(loaded.search('"home run"', player="player-jt")) == ["u1", "u2"]
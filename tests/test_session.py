@@ -0,0 +1,366 @@
+"""
+Unit Tests for the caching HTTP session
+"""
+
+import http.server
+import inspect
+import os
+import socket
+import threading
+import time
+
+import pytest
+import requests
+from blaseball_mike import session as session_module
+from blaseball_mike.models import Base
+from blaseball_mike.session import session, check_network_response, configure_cache, prewarm, record_requests, \
+    add_request_hook, remove_request_hook, ContextThreadPoolExecutor, detect_n_plus_one, NPlusOneWarning, NPlusOneError
+
+
+class _ETagHandler(http.server.BaseHTTPRequestHandler):
+    ETAG = '"mike-1"'
+    full_responses = 0
+    not_modified_responses = 0
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == self.ETAG:
+            type(self).not_modified_responses += 1
+            self.send_response(304)
+            self.send_header("ETag", self.ETAG)
+            self.end_headers()
+            return
+
+        type(self).full_responses += 1
+        body = b'{"id": "thisidisstaticyo"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", self.ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _CounterHandler(http.server.BaseHTTPRequestHandler):
+    requests = 0
+
+    def do_GET(self):
+        type(self).requests += 1
+        body = f'{{"count": {self.requests}}}'.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def etag_server(http_server):
+    _ETagHandler.full_responses = 0
+    _ETagHandler.not_modified_responses = 0
+    return http_server(_ETagHandler)
+
+
+@pytest.fixture
+def counter_server(http_server):
+    _CounterHandler.requests = 0
+    return http_server(_CounterHandler)
+
+
+@pytest.fixture
+def cache_enabled(monkeypatch):
+    """Allow caching for this test only, using a fresh set of sessions"""
+    monkeypatch.delenv("BLASEBALL_MIKE_NOCACHE", raising=False)
+    monkeypatch.setattr(session_module, "_SESSIONS_BY_EXPIRY", {})
+    yield
+    configure_cache(stale_while_revalidate=False)
+
+
+def test_session_revalidates_expired(etag_server):
+    s = session(0)
+    first = check_network_response(s.get(f"{etag_server}/revalidate"))
+    second = check_network_response(s.get(f"{etag_server}/revalidate"))
+
+    assert first == second == {"id": "thisidisstaticyo"}
+    assert _ETagHandler.full_responses == 1
+    assert _ETagHandler.not_modified_responses == 1
+
+
+def test_session_stale_while_revalidate(counter_server, cache_enabled):
+    s = session(1)
+    assert check_network_response(s.get(f"{counter_server}/swr")) == {"count": 1}
+    time.sleep(1.1)
+
+    configure_cache(stale_while_revalidate=True)
+    assert check_network_response(s.get(f"{counter_server}/swr")) == {"count": 1}
+
+    # The refresh happens in the background; the next caller gets the new copy
+    for _ in range(50):
+        if _CounterHandler.requests == 2:
+            break
+        time.sleep(0.05)
+    time.sleep(0.1)
+    assert check_network_response(s.get(f"{counter_server}/swr")) == {"count": 2}
+
+
+def test_session_stale_while_revalidate_nocache(counter_server, cache_enabled, monkeypatch):
+    monkeypatch.setenv("BLASEBALL_MIKE_NOCACHE", "1")
+    configure_cache(stale_while_revalidate=True)
+    s = session(1)
+    assert check_network_response(s.get(f"{counter_server}/nocache")) == {"count": 1}
+    assert check_network_response(s.get(f"{counter_server}/nocache")) == {"count": 2}
+
+
+def test_prewarm(counter_server, cache_enabled):
+    def fetch():
+        return check_network_response(session(60).get(f"{counter_server}/prewarm"))
+
+    warmer = prewarm([fetch], interval=60)
+    for _ in range(50):
+        if _CounterHandler.requests == 1:
+            break
+        time.sleep(0.05)
+    warmer.stop()
+    warmer.join(timeout=1)
+
+    assert not warmer.is_alive()
+    assert fetch() == {"count": 1}
+    assert _CounterHandler.requests == 1
+
+
+def test_prewarm_survives_errors():
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise KeyError("crabs")
+
+    warmer = prewarm([broken], interval=0.01)
+    for _ in range(50):
+        if len(calls) >= 3:
+            break
+        time.sleep(0.02)
+    warmer.stop()
+    warmer.join(timeout=1)
+
+    assert len(calls) >= 3
+    assert isinstance(warmer.last_error, KeyError)
+
+
+def test_session_cache_disabled(counter_server, cache_enabled):
+    s = session(60)
+    assert check_network_response(s.get(f"{counter_server}/disabled")) == {"count": 1}
+
+    configure_cache(enabled=False)
+    try:
+        assert check_network_response(s.get(f"{counter_server}/disabled")) == {"count": 2}
+        assert check_network_response(session(60).get(f"{counter_server}/disabled")) == {"count": 3}
+    finally:
+        configure_cache(enabled=True)
+    assert check_network_response(s.get(f"{counter_server}/disabled")) == {"count": 1}
+
+
+class _SlowHandler(_CounterHandler):
+    def do_GET(self):
+        time.sleep(0.3)
+        super().do_GET()
+
+
+def test_session_coalesces_concurrent_requests(http_server):
+    _SlowHandler.requests = 0
+    url = http_server(_SlowHandler)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def fetch():
+        barrier.wait()
+        results.append(check_network_response(session(0).get(f"{url}/coalesce", params={"id": "crabs"})))
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{"count": 1}] * 8
+    assert _SlowHandler.requests == 1
+
+
+def test_record_requests(counter_server, cache_enabled):
+    class _Model(Base):
+        @Base.lazy_load("_count_url", cache_name="_count")
+        def count(self):
+            return check_network_response(session(60).get(self._count_url, params={"id": "crabs"}))["count"]
+
+    with record_requests() as log:
+        model = _Model({"count": f"{counter_server}/record"})
+        assert model.count == 1
+        assert model.count == 1
+        check_network_response(session(60).get(f"{counter_server}/record?id=crabs"))
+
+    assert len(log) == 2
+    first, second = log.records
+    assert first.method == "GET"
+    assert first.endpoint == f"{counter_server}/record"
+    assert first.params == {"id": "crabs"}
+    assert first.status == 200
+    assert first.from_cache is False
+    assert first.bytes == len(b'{"count": 1}')
+    assert first.elapsed > 0
+    assert first.caller == "_Model.count"
+    assert second.from_cache is True
+    assert second.caller is None
+
+    assert log.counts(by="caller") == {"_Model.count": 1, None: 1}
+    assert log.json()[0]["caller"] == "_Model.count"
+    metrics = log.prometheus()
+    assert "# TYPE blaseball_mike_requests_total counter" in metrics
+    assert f'blaseball_mike_requests_total{{endpoint="{counter_server}/record",caller="_Model.count",cache="miss"}} 1' \
+        in metrics
+    assert f'blaseball_mike_requests_total{{endpoint="{counter_server}/record",cache="hit"}} 1' in metrics
+
+    # Nothing is recorded once the block exits
+    check_network_response(session(60).get(f"{counter_server}/record?id=pies"))
+    assert len(log) == 2
+
+
+def test_request_hook(counter_server):
+    records = []
+    add_request_hook(records.append)
+    try:
+        check_network_response(session(0).get(f"{counter_server}/hook"))
+    finally:
+        remove_request_hook(records.append)
+    check_network_response(session(0).get(f"{counter_server}/hook"))
+    assert [x.endpoint for x in records] == [f"{counter_server}/hook"]
+
+
+def test_record_failed_request():
+    # Nothing listens on a port that was just released
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+    with record_requests() as log:
+        with pytest.raises(requests.ConnectionError):
+            session(0).get(f"{url}/closed", timeout=1)
+    record, = log.records
+    assert record.endpoint == f"{url}/closed"
+    assert record.status is None
+    assert record.bytes == 0
+    assert "ConnectionError" in record.error
+
+
+def test_record_requests_worker_threads(counter_server):
+    def fetch():
+        return check_network_response(session(0).get(f"{counter_server}/worker"))
+
+    with record_requests() as log:
+        token = session_module._REQUEST_CALLER.set("Game.load_by_days")
+        try:
+            with ContextThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(lambda _: fetch(), range(3)))
+        finally:
+            session_module._REQUEST_CALLER.reset(token)
+    assert [x.caller for x in log.records] == ["Game.load_by_days"] * 3
+
+
+class _Counted(Base):
+    @Base.lazy_load("_count_url", cache_name="_count")
+    def count(self):
+        return check_network_response(session(0).get(self._count_url))["count"]
+
+
+def test_detect_n_plus_one(counter_server):
+    models = [_Counted({"count": f"{counter_server}/n_plus_one?id={x}"}) for x in range(4)]
+
+    with detect_n_plus_one(threshold=2) as counts:
+        with pytest.warns(NPlusOneWarning, match=r"_Counted.count sent 3 requests \(threshold 2\)") as record:
+            for model in models:
+                model.count
+    assert counts == {"_Counted.count": 4}
+    assert len(record) == 1
+    assert record[0].filename == __file__
+
+
+def test_detect_n_plus_one_call_site(counter_server, monkeypatch):
+    """Warnings point at the code reading the attribute, even when the package directory is a prefix of its path"""
+    models = [_Counted({"count": f"{counter_server}/n_plus_one?id={x}"}) for x in range(4)]
+    lines = []
+
+    def read(model):
+        lines.append(inspect.currentframe().f_lineno + 1)
+        model.count
+
+    # A sibling directory sharing the package directory as a prefix is not part of the package
+    monkeypatch.setattr(session_module, "_PACKAGE_DIR", os.path.dirname(__file__)[:-1])
+    with detect_n_plus_one(threshold=1):
+        with pytest.warns(NPlusOneWarning) as record:
+            for model in models[:2]:
+                read(model)
+    assert (record[0].filename, record[0].lineno) == (__file__, lines[-1])
+
+    # Without any frame outside the package (every path in this thread starts with os.sep), fall back to the reader
+    monkeypatch.setattr(session_module, "_PACKAGE_DIR", "")
+    with detect_n_plus_one(threshold=1):
+        with pytest.warns(NPlusOneWarning) as record:
+            with ContextThreadPoolExecutor(max_workers=1) as executor:
+                for model in models[2:]:
+                    executor.submit(read, model).result()
+    assert (record[0].filename, record[0].lineno) == (__file__, lines[-1])
+
+
+def test_detect_n_plus_one_raise(counter_server, recwarn):
+    models = [_Counted({"count": f"{counter_server}/n_plus_one?id={x}"}) for x in range(4)]
+
+    with detect_n_plus_one(threshold=3, action="raise"):
+        for model in models[:3]:
+            model.count
+        with pytest.raises(NPlusOneError, match=f"{__file__}"):
+            models[3].count
+        # Requests outside of lazy loading are not counted
+        check_network_response(session(0).get(f"{counter_server}/n_plus_one"))
+    assert len(recwarn) == 0
+    assert session_module._REQUEST_HOOKS == []
+
+    with pytest.raises(ValueError):
+        with detect_n_plus_one(action="explode"):
+            pass
+
+
+def test_detect_n_plus_one_raise_runs_hooks(counter_server):
+    models = [_Counted({"count": f"{counter_server}/n_plus_one?id={x}"}) for x in range(2)]
+
+    with detect_n_plus_one(threshold=1, action="raise"):
+        with record_requests() as log:
+            models[0].count
+            with pytest.raises(NPlusOneError):
+                models[1].count
+    # Hooks registered after the detector still saw the request
+    assert len(log) == 2
+
+
+def test_detect_n_plus_one_scope(counter_server):
+    models = [_Counted({"count": f"{counter_server}/n_plus_one?id={x}"}) for x in range(4)]
+    started, finished = threading.Event(), threading.Event()
+
+    def other_thread():
+        with detect_n_plus_one(threshold=1, action="raise") as counts:
+            started.set()
+            finished.wait(5)
+        return counts
+
+    with ContextThreadPoolExecutor(max_workers=1) as executor:
+        other = executor.submit(other_thread)
+        started.wait(5)
+        with detect_n_plus_one(threshold=10) as counts:
+            for model in models:
+                model.count
+        finished.set()
+        assert other.result() == {}
+    assert counts == {"_Counted.count": 4}
@@ -297,3 +297,79 @@ class TestPlayerStatsheet(TestBase):
     def player_statsheet(self, request):
         """Parameterized fixture of various player statsheets"""
         return request.getfixturevalue(request.param)
+
+
+class TestStatsheetTable:
+    @pytest.fixture
+    def table(self, monkeypatch):
+        from blaseball_mike import chronicler, database
+        from blaseball_mike.models import StatsheetTable
+        calls = []
+
+        def get_games(**kwargs):
+            calls.append("games")
+            return [{"gameId": f"game-{day}", "data": {
+                "id": f"game-{day}", "season": 11, "day": day - 1, "homeTeam": "home", "awayTeam": "away",
+                "statsheet": f"game-sheet-{day}"}} for day in (1, 2, 3)]
+
+        def get_game_statsheets(ids):
+            calls.append("game_statsheets")
+            return {id_: {"id": id_, "homeTeamStats": f"home-{id_}", "awayTeamStats": f"away-{id_}"} for id_ in ids}
+
+        def get_team_statsheets(ids):
+            calls.append("team_statsheets")
+            return {id_: {"id": id_, "playerStats": [f"{id_}-batter", f"{id_}-pitcher"]} for id_ in ids}
+
+        def get_player_statsheets(ids):
+            calls.append("player_statsheets")
+            sheets = {}
+            for id_ in ids:
+                side = "home" if id_.startswith("home") else "away"
+                if id_.endswith("batter"):
+                    sheets[id_] = {"id": id_, "playerId": f"{side}-batter", "atBats": 4, "hits": 2,
+                                   "doubles": 1, "homeRuns": 1, "walks": 1}
+                else:
+                    sheets[id_] = {"id": id_, "playerId": f"{side}-pitcher", "outsRecorded": 27,
+                                   "earnedRuns": 3, "strikeouts": 9, "hitsAllowed": 6, "walksIssued": 3}
+            return sheets
+
+        monkeypatch.setattr(chronicler, "get_games", get_games)
+        monkeypatch.setattr(database, "get_game_statsheets", get_game_statsheets)
+        monkeypatch.setattr(database, "get_team_statsheets", get_team_statsheets)
+        monkeypatch.setattr(database, "get_player_statsheets", get_player_statsheets)
+
+        table = StatsheetTable.load(12, start_day=2, end_day=3)
+        assert calls == ["games", "game_statsheets", "team_statsheets", "player_statsheets"]
+        return table
+
+    def test_rows(self, table):
+        assert len(table) == 8
+        assert sorted(set(table.days)) == [2, 3]
+        assert len(table.columns["hits"]) == 8
+
+    def test_totals(self, table):
+        totals = table.totals()
+        assert totals["home-batter"]["hits"] == 4
+        assert totals["away-pitcher"]["outsRecorded"] == 54
+        team_totals = table.totals(by="team", stats=["hits", "strikeouts"])
+        assert team_totals["home"] == {"hits": 4, "strikeouts": 18}
+        with pytest.raises(ValueError):
+            table.totals(by="game")
+
+    def test_rates(self, table):
+        rates = table.rates()
+        assert rates["home-batter"]["batting_average"] == 0.5
+        assert rates["home-batter"]["on_base_percentage"] == 0.6
+        assert rates["home-batter"]["slugging"] == 1.5
+        assert rates["home-pitcher"]["earned_run_average"] == 3
+        assert rates["home-pitcher"]["whip"] == 1
+        assert rates["home-pitcher"]["batting_average"] is None
+
+    def test_float_stats(self):
+        from blaseball_mike.models import StatsheetTable
+        table = StatsheetTable()
+        table.append({"playerId": "pitcher", "earnedRuns": 2, "outsRecorded": 3})
+        table.append({"playerId": "pitcher", "earnedRuns": 1.5, "outsRecorded": 3})
+        assert table.columns["earnedRuns"].typecode == "d"
+        assert table.columns["outsRecorded"].typecode == "l"
+        assert table.totals()["pitcher"]["earnedRuns"] == 3.5
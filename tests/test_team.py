@@ -282,3 +282,55 @@ class TestTeam(TestBase):
     def team(self, request):
         """Parameterized fixture of various teams"""
         return request.getfixturevalue(request.param)
+
+
+class TestTeamRosters:
+    @staticmethod
+    def _team(id_, players):
+        return {"id": id_, "lineup": players[:3], "rotation": players[3:5], "bullpen": players[5:6],
+                "bench": [], "shadows": players[6:]}
+
+    def test_load_all_with_rosters(self, monkeypatch):
+        from blaseball_mike import database
+        requests = []
+
+        def get_all_teams():
+            return {
+                "team-a": self._team("team-a", [f"a-{i}" for i in range(8)]),
+                "team-b": self._team("team-b", [f"b-{i}" for i in range(8)]),
+            }
+
+        def get_player(ids):
+            requests.append(ids)
+            return {id_: {"id": id_} for id_ in ids}
+
+        monkeypatch.setattr(database, "get_all_teams", get_all_teams)
+        monkeypatch.setattr(database, "get_player", get_player)
+
+        teams = Team.load_all_with_rosters()
+        assert len(requests) == 1
+        assert len(requests[0]) == 16
+        assert [p.id for p in teams["team-a"].lineup] == ["a-0", "a-1", "a-2"]
+        assert [p.id for p in teams["team-b"].shadows] == ["b-6", "b-7"]
+        assert teams["team-b"].bench == []
+        assert len(requests) == 1
+
+    def test_load_roster_at_time(self, monkeypatch):
+        from datetime import datetime
+        from blaseball_mike import chronicler, database
+        requests = []
+
+        def get_entities(type_, id_=None, at=None):
+            requests.append((type_, list(id_), at))
+            return [{"entityId": x, "data": {"id": x}} for x in id_]
+
+        monkeypatch.setattr(chronicler, "get_entities", get_entities)
+        monkeypatch.setattr(database, "MAX_IDS_PER_REQUEST", 5)
+
+        time = datetime(2021, 3, 1)
+        team = Team(dict(self._team("team-a", [f"a-{i}" for i in range(8)]), timestamp=time))
+        team.load_roster()
+        assert len(requests) == 2
+        assert all(at == time for _, _, at in requests)
+        assert [p.id for p in team.rotation] == ["a-3", "a-4"]
+        assert team.rotation[0].timestamp == time
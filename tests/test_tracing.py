@@ -0,0 +1,124 @@
+"""
+Unit Tests for tracing spans
+"""
+
+import http.server
+import inspect
+import json
+
+import pytest
+from blaseball_mike import session as session_module, tracing
+from blaseball_mike.models import Base, Game
+from blaseball_mike.session import session, check_network_response
+
+
+class _ChildHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"id": self.path, "child": f"{self.path}/child"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def child_server(http_server):
+    return http_server(_ChildHandler)
+
+
+class _Node(Base):
+    url = None
+
+    @classmethod
+    def load(cls, path):
+        return cls(check_network_response(session(0).get(f"{cls.url}{path}")))
+
+    @Base.lazy_load("_child_path", cache_name="_child")
+    def child(self):
+        return _Node.load(self._child_path)
+
+
+def test_trace(child_server):
+    _Node.url = child_server
+    with tracing.trace() as recorder:
+        node = _Node.load("/crabs")
+        assert node.child.id == "/crabs/child"
+        assert node.child.id == "/crabs/child"
+
+    load, lazy = recorder.children(None)
+    assert (load.name, load.kind) == ("_Node.load", "load")
+    assert (lazy.name, lazy.kind) == ("_Node.child", "lazy_load")
+    assert load.trace_id != lazy.trace_id
+
+    request, = recorder.children(load)
+    assert request.kind == "http"
+    assert request.name == f"GET {child_server}/crabs"
+    assert request.attributes["cache"] == "miss"
+    assert request.attributes["status"] == 200
+    assert request.trace_id == load.trace_id
+
+    child_load, = recorder.children(lazy)
+    assert child_load.name == "_Node.load"
+    child_request, = recorder.children(child_load)
+    assert child_request.name == f"GET {child_server}/crabs/child"
+    assert child_request.attributes["caller"] == "_Node.child"
+    assert child_load.duration <= lazy.duration
+    assert len(recorder.spans) == 5
+
+    # Tracing is off again
+    assert tracing._EXPORTERS == []
+    assert session_module._REQUEST_HOOKS == []
+    _Node.load("/pies")
+    assert len(recorder.spans) == 5
+
+
+def test_trace_file(child_server, tmp_path):
+    _Node.url = child_server
+    path = str(tmp_path / "trace.jsonl")
+    with tracing.trace(path):
+        _Node.load("/crabs").child
+
+    with open(path) as f:
+        spans = [json.loads(line) for line in f]
+    assert [x["kind"] for x in spans] == ["http", "load", "http", "load", "lazy_load"]
+    by_id = {x["span_id"]: x for x in spans}
+    assert by_id[spans[0]["parent_id"]]["name"] == "_Node.load"
+    assert spans[1]["parent_id"] is None
+    assert spans[3]["parent_id"] == spans[4]["span_id"]
+
+
+def test_trace_lazy_load_without_request_hooks(monkeypatch):
+    """Lazy load spans do not depend on the request hook tracing registers"""
+    class _Local(Base):
+        @Base.lazy_load("_value", cache_name="_doubled")
+        def doubled(self):
+            return self._value * 2
+
+    with tracing.trace() as recorder:
+        with monkeypatch.context() as m:
+            m.setattr(session_module, "_REQUEST_HOOKS", [])
+            assert _Local({"doubled": 2}).doubled == 4
+    span, = recorder.spans
+    assert (span.name, span.kind) == ("_Local.doubled", "lazy_load")
+
+
+def test_span_error():
+    with tracing.trace() as recorder:
+        with pytest.raises(ValueError):
+            with tracing.span("explode", "load"):
+                raise ValueError("Crabs")
+    assert recorder.spans[0].error == "ValueError('Crabs')"
+
+
+def test_tracing_off():
+    with tracing.span("quiet", "load") as span:
+        assert span is None
+
+
+def test_traced_loads():
+    assert hasattr(Game.load_by_id, "__wrapped__")
+    assert inspect.isgeneratorfunction(Game.load_by_days)
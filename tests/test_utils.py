@@ -0,0 +1,34 @@
+"""
+Unit Tests for misc utils
+"""
+
+from datetime import timezone
+
+import pytest
+from dateutil.parser import parse
+from blaseball_mike import utils
+from blaseball_mike.utils import parse_timestamp
+
+
+@pytest.mark.parametrize("value", [
+    "2021-03-19T06:18:25.709Z",
+    "2020-08-01T15:00:01.84Z",
+    "2020-11-16T17:22:13.099255Z",
+    "2021-03-01T00:00:00Z",
+    "2021-03-01",
+    "2021-03-01T04:00:00+02:00",
+    "March 1 2021 10:00",
+])
+def test_parse_timestamp(value):
+    parsed = parse_timestamp(value)
+    assert parsed == parse(value)
+    assert (parsed.tzinfo is None) == (parse(value).tzinfo is None)
+    assert parse_timestamp(value) is parsed
+
+
+@pytest.mark.parametrize("value", ["2020-08-01T15:00:01.84Z", "2021-03-01T00:00:00Z"])
+def test_parse_timestamp_api_format(value, monkeypatch):
+    """API timestamps never reach dateutil, whatever the Python version"""
+    parse_timestamp.cache_clear()
+    monkeypatch.setattr(utils, "parse", None)
+    assert parse_timestamp(value).tzinfo is timezone.utc